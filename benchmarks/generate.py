@@ -0,0 +1,90 @@
+"""
+Generators for synthetic Python sources that are used to benchmark
+mydocstring at a controlled scale. Each generator returns the source code as a
+string together with a query that can be passed to `extract.extract`.
+"""
+
+ARGS_DOCSTRING = '''
+    Summary of %(name)s.
+
+    Args:
+%(args)s
+    Returns:
+        bool: `True` on success.
+
+'''
+
+def _arglist(num_args, blank_lines=0, indent=8):
+    lines = []
+    for i in range(num_args):
+        lines.append(' ' * indent + 'arg%d (`int`): Description of arg%d.' %
+                     (i, i))
+        lines.append(' ' * (indent + 4) + 'Continued on the next line.')
+        lines.extend([''] * blank_lines)
+    return '\n'.join(lines) + '\n'
+
+def _function(name, num_args=3, blank_lines=0, indent=0, method=False):
+    pad = ' ' * indent
+    args = ', '.join(['arg%d' % i for i in range(num_args)])
+    if method:
+        args = 'self, ' + args if args else 'self'
+    doc = ARGS_DOCSTRING % {'name' : name,
+                            'args' : _arglist(num_args, blank_lines,
+                                              indent + 8)}
+    doc = '\n'.join([(pad + line if line else line)
+                     for line in doc.split('\n')])
+    return (pad + 'def %s(%s):\n' % (name, args) +
+            pad + '    """' + doc + pad + '    """\n' +
+            pad + '    return True\n\n')
+
+def many_functions(num_functions=1000):
+    """
+    Generates a module with many functions. The query targets the last
+    function so that the whole file has to be searched.
+    """
+    src = ['"""\nModule with %d functions.\n"""\n\n' % num_functions]
+    for i in range(num_functions):
+        src.append(_function('function_%d' % i))
+    return ''.join(src), 'function_%d' % (num_functions - 1)
+
+def huge_class(num_methods=1000):
+    """
+    Generates a module with a single class that has many methods. The query
+    targets the last method.
+    """
+    src = ['class HugeClass(object):\n    """\n    A huge class.\n    """\n\n']
+    for i in range(num_methods):
+        src.append(_function('method_%d' % i, indent=4, method=True))
+    return ''.join(src), 'HugeClass.method_%d' % (num_methods - 1)
+
+def long_docstring(num_lines=5000):
+    """
+    Generates a function with a very long docstring.
+    """
+    body = '\n'.join(['    Line %d of a very long description.' % i
+                      for i in range(num_lines)])
+    src = ('def long_docstring(arg):\n    """\n    Summary.\n\n' + body +
+           '\n\n    Args:\n        arg: The argument.\n    """\n    pass\n')
+    return src, 'long_docstring'
+
+def blank_args(num_args=500, blank_lines=3):
+    """
+    Generates a function whose argument list is interleaved with many blank
+    lines.
+    """
+    return (_function('blank_args', num_args=num_args,
+                      blank_lines=blank_lines), 'blank_args')
+
+def missing_symbol(num_functions=1000):
+    """
+    Generates a module with many functions and a query for a function that
+    does not exist.
+    """
+    src = many_functions(num_functions)[0]
+    return src, 'missing_function'
+
+GENERATORS = {'many_functions' : many_functions,
+              'huge_class' : huge_class,
+              'long_docstring' : long_docstring,
+              'blank_args' : blank_args,
+              'missing_symbol' : missing_symbol}
@@ -0,0 +1,219 @@
+"""
+Benchmark suite for mydocstring.
+
+Times extraction, parsing, JSON output, and Markdown rendering on synthetic
+sources (see `generate.py`), and compares the results against a stored
+baseline.
+
+Usage:
+  run.py [--scale=<s>] [--repeat=<n>] [--save] [--check] [--threshold=<t>]
+         [--min-time=<t>] [--baseline=<file>]
+
+Options:
+  --scale=<s>         Multiply the size of each generated source by this
+                      factor [default: 1].
+  --repeat=<n>        Number of repetitions; the fastest is reported
+                      [default: 5].
+  --save              Store the results as the new baseline.
+  --check             Exit with a non-zero status if any benchmark is slower
+                      than the baseline by more than the threshold.
+  --threshold=<t>     Allowed slowdown relative to the baseline [default: 2.0].
+  --min-time=<t>      Times (seconds per call) below this floor are compared
+                      as if they took this long. Each measurement already
+                      takes at least 0.2 seconds, so the floor is off by
+                      default; if set, keep it well below the fastest
+                      benchmark, or regressions of those below it are hidden
+                      [default: 0].
+  --baseline=<file>   Baseline file [default: benchmarks/baseline.json].
+
+The baseline records the scale and number of repetitions it was measured
+with, and results measured at a different scale are not compared against it.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import generate
+from mydocstring import extract
+from mydocstring import parse
+
+SIZES = {'many_functions' : 1000,
+         'huge_class' : 1000,
+         'long_docstring' : 5000,
+         'blank_args' : 500,
+         'missing_symbol' : 1000}
+
+def setup(directory, scale=1):
+    """
+    Writes each generated source to `directory`.
+
+    Returns:
+        dict: Maps each generator name to a tuple `(filename, query)`.
+    """
+    cases = {}
+    for name, gen in generate.GENERATORS.items():
+        src, query = gen(int(SIZES[name] * scale))
+        filename = os.path.join(directory, name + '.py')
+        with open(filename, 'w') as fh:
+            fh.write(src)
+        cases[name] = (filename, query)
+    return cases
+
+def benchmarks(cases):
+    """
+    Returns a dictionary that maps the name of each benchmark to a function
+    without arguments that runs it.
+    """
+    from mako.template import Template
+    template = Template(filename=os.path.join(
+        os.path.dirname(extract.__file__), 'templates/google_docstring.md'))
+
+    def parsed(filename, query):
+        match = extract.extract(filename, query)
+        google = parse.parser(match['docstring'])
+        google.parse()
+        return match, google
+
+    def _extract(filename, query):
+        def run():
+            try:
+                extract.extract(filename, query)
+            except NameError:
+                pass
+        return run
+
+    def _parse(filename, query):
+        match = extract.extract(filename, query)
+        return lambda: parse.parser(match['docstring']).parse()
+
+    def _json(filename, query):
+        google = parsed(filename, query)[1]
+        data = list(google.data)
+        def run():
+            # `__json__` appends the header to `data`, so restore it each time.
+            google.data = list(data)
+            google.__json__()
+        return run
+
+    def _markdown(filename, query):
+        match, google = parsed(filename, query)
+        def run():
+            headers, data = google.markdown()
+            template.render(header=match, sections=data, headers=headers,
+                            h1='#', h2='##', h3='###')
+        return run
+
+    out = {}
+    for name, (filename, query) in cases.items():
+        out['extract.' + name] = _extract(filename, query)
+        if name == 'missing_symbol':
+            continue
+        out['parse.' + name] = _parse(filename, query)
+        out['json.' + name] = _json(filename, query)
+        out['markdown.' + name] = _markdown(filename, query)
+    return out
+
+def run(scale=1, repeat=5):
+    """
+    Runs all benchmarks. Each benchmark is called enough times for a single
+    measurement to take at least 0.2 seconds, and the fastest of `repeat`
+    measurements is reported.
+
+    Returns:
+        dict: Maps the name of each benchmark to its time per call in seconds.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        funcs = benchmarks(setup(directory, scale))
+        results = {}
+        for name, func in sorted(funcs.items()):
+            timer = timeit.Timer(func)
+            number = timer.autorange()[0]
+            results[name] = min(timer.repeat(repeat=repeat,
+                                             number=number)) / number
+        return results
+    finally:
+        shutil.rmtree(directory)
+
+def ratio(result, baseline, min_time=0.0):
+    """
+    Returns the slowdown of a result relative to the baseline. Times below
+    `min_time` are replaced by `min_time`.
+    """
+    return max(result, min_time) / max(baseline, min_time)
+
+def check(results, baseline, threshold=2.0, min_time=0.0):
+    """
+    Compares results against a baseline.
+
+    Returns:
+        list: The names of the benchmarks that are slower than the baseline by
+            more than `threshold` (see `ratio`).
+    """
+    return [name for name in sorted(results)
+            if name in baseline and
+            ratio(results[name], baseline[name], min_time) > threshold]
+
+def load_baseline(filename):
+    """
+    Loads a baseline.
+
+    Returns:
+        dict: A dictionary with the keys `scale`, `repeat`, and `results`, or
+            `None` if the file does not exist. The scale of baselines that
+            were stored without it is `None`.
+    """
+    if not os.path.exists(filename):
+        return None
+    with open(filename) as fh:
+        data = json.load(fh)
+    if 'results' not in data:
+        data = {'scale' : None, 'repeat' : None, 'results' : data}
+    return data
+
+def main():
+    from docopt import docopt
+    options = docopt(__doc__)
+    scale = float(options['--scale'])
+    repeat = int(options['--repeat'])
+    min_time = float(options['--min-time'])
+    baseline_file = options['--baseline']
+    saved = load_baseline(baseline_file)
+    if options['--check'] and not saved:
+        sys.exit('No baseline found: %s' % baseline_file)
+    if options['--check'] and saved['scale'] != scale:
+        sys.exit('The baseline was measured with --scale=%s, not %g; store '
+                 'a new baseline using --save' % (saved['scale'], scale))
+
+    results = run(scale, repeat)
+    baseline = {}
+    if saved and saved['scale'] == scale:
+        baseline = saved['results']
+
+    for name in sorted(results):
+        slowdown = ''
+        if name in baseline:
+            slowdown = '%6.2fx' % ratio(results[name], baseline[name],
+                                        min_time)
+        print('%-32s %10.6f s %s' % (name, results[name], slowdown))
+
+    if options['--save']:
+        with open(baseline_file, 'w') as fh:
+            json.dump({'scale' : scale, 'repeat' : repeat,
+                       'results' : results}, fh, sort_keys=True, indent=4,
+                      separators=(',', ': '))
+
+    if options['--check']:
+        slow = check(results, baseline, float(options['--threshold']),
+                     min_time)
+        if slow:
+            print('Slower than baseline: %s' % ', '.join(slow))
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+This module provides an asyncio API for extracting and parsing docstrings
+without blocking the event loop. Files are read in an executor for I/O, and
+searching and parsing run in an executor for CPU work. The number of jobs
+submitted to the executors at once is bounded.
+
+Concurrent requests for the same file are coalesced: the file is read once,
+and its index (needed to resolve inherited docstrings) is built once, no
+matter how many queries for the file are in flight. Files are read again by
+later requests, so changes to the files are picked up.
+
+Example:
+    ```
+    from mydocstring import aio
+    docstrings = await aio.aextract_many([('module.py', 'function'),
+                                          ('module.py', 'Class.method')])
+    parser = await aio.aparse(docstrings[0]['docstring'])
+    ```
+
+"""
+import asyncio
+import weakref
+
+_DEFAULT = None
+
+class AsyncExtract(object):
+    """
+    Extracts and parses docstrings using executors.
+
+    Attributes:
+        io_executor : The executor used to read files, or `None` to use the
+            default executor of the event loop.
+        cpu_executor : The executor used to search for and parse docstrings,
+            or `None` to use the default executor of the event loop. Process
+            pools are supported, but the index of a file is then built by
+            each worker process that needs it.
+        concurrency : The maximum number of jobs that are submitted to the
+            executors at once by each event loop.
+
+    """
+
+    def __init__(self, io_executor=None, cpu_executor=None, concurrency=16):
+        self.io_executor = io_executor
+        self.cpu_executor = cpu_executor
+        self.concurrency = concurrency
+        # The semaphore and the jobs in flight belong to the event loop they
+        # were created in, so each running loop gets its own.
+        self._loops = weakref.WeakKeyDictionary()
+
+    async def extract(self, filename, query, inherit=False):
+        """
+        Extracts a docstring from a file (see `extract.extract`).
+        """
+        extractor = await self._coalesce(('read', filename), self.io_executor,
+                                         _load, filename)
+        if inherit:
+            await self._coalesce(('index', filename), self.cpu_executor,
+                                 _build_index, extractor)
+        return await self._run(self.cpu_executor, _query, extractor, query,
+                               inherit)
+
+    async def extract_many(self, queries, inherit=False,
+                           return_exceptions=False):
+        """
+        Extracts many docstrings concurrently.
+
+        Args:
+            queries : A list of tuples containing a filename and a query.
+            inherit : Set to `True` to resolve method docstrings through base
+                classes.
+            return_exceptions : Set to `True` to return exceptions (e.g., a
+                `NameError` for a missing symbol) in place of the results
+                instead of raising the first one.
+
+        Returns:
+            list: The results (see `Extract.find`) in the order of `queries`.
+
+        """
+        return await asyncio.gather(*[self.extract(filename, query, inherit)
+                                      for filename, query in queries],
+                                    return_exceptions=return_exceptions)
+
+    async def parse(self, docstring, choice='Google', filename=''):
+        """
+        Parses a docstring (see `parse.parser`).
+
+        Returns:
+            The parser, after `parse` has been called.
+
+        """
+        return await self._run(self.cpu_executor, _parse, docstring, choice,
+                               filename)
+
+    def _coalesce(self, key, executor, func, *args):
+        """
+        Runs a job unless a job with the same key is already running, and
+        returns an awaitable for its result. Cancelling one of the callers
+        does not cancel the job for the others.
+        """
+        pending = self._state()['pending']
+        future = pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(executor, func, *args))
+            pending[key] = future
+            future.add_done_callback(lambda _: pending.pop(key, None))
+        return asyncio.shield(future)
+
+    async def _run(self, executor, func, *args):
+        async with self._state()['semaphore']:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, func, *args)
+
+    def _state(self):
+        """
+        Returns the semaphore and the jobs in flight of the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = {'semaphore' : asyncio.Semaphore(self.concurrency),
+                     'pending' : {}}
+            self._loops[loop] = state
+        return state
+
+def _load(filename):
+    from . import extract
+    return extract.extractor(filename)
+
+def _build_index(extractor):
+    extractor.index
+
+def _query(extractor, query, inherit):
+    import copy
+    # Extractors keep the state of the current query, so each query uses a
+    # copy that shares the source.
+    extractor = copy.copy(extractor)
+    extractor.inherit = inherit
+    return extractor.extract(query)
+
+def _parse(docstring, choice, filename):
+    from . import parse
+    parser = parse.parser(docstring, choice, filename)
+    parser.parse()
+    return parser
+
+def configure(io_executor=None, cpu_executor=None, concurrency=16):
+    """
+    Sets the executors and the concurrency used by `aextract`,
+    `aextract_many`, and `aparse` (see `AsyncExtract`).
+
+    Returns:
+        The new default `AsyncExtract`.
+
+    """
+    global _DEFAULT
+    _DEFAULT = AsyncExtract(io_executor, cpu_executor, concurrency)
+    return _DEFAULT
+
+def default():
+    """
+    Returns the default `AsyncExtract`, creating it if needed.
+    """
+    if _DEFAULT is None:
+        configure()
+    return _DEFAULT
+
+async def aextract(filename, query, inherit=False):
+    """
+    Extracts a docstring without blocking the event loop (see
+    `extract.extract`).
+    """
+    return await default().extract(filename, query, inherit)
+
+async def aextract_many(queries, inherit=False, return_exceptions=False):
+    """
+    Extracts many docstrings concurrently (see `AsyncExtract.extract_many`).
+    """
+    return await default().extract_many(queries, inherit, return_exceptions)
+
+async def aparse(docstring, choice='Google', filename=''):
+    """
+    Parses a docstring without blocking the event loop (see `parse.parser`).
+    """
+    return await default().parse(docstring, choice, filename)
@@ -0,0 +1,184 @@
+"""
+This module checks docstring coverage and consistency. Each file is indexed
+in a single pass (see `index.scan`) and the following problems are reported:
+    * Public classes, functions, and methods without a docstring. Names
+      that start with an underscore, and functions nested in other functions,
+      are considered private.
+    * Arguments in the `Args` section that are not in the signature, and
+      arguments in the signature that are missing from the `Args` section.
+      Functions without an `Args` section are not checked.
+    * Docstrings with an `Args` section that cannot be parsed.
+
+Files are checked in parallel using a process pool.
+"""
+import re
+
+ARGS = ('Args', 'Arguments')
+
+_ARGS = re.compile(r'^\s*(%s):' % '|'.join(ARGS), re.M)
+
+def check(paths, jobs=None):
+    """
+    Checks all `.py` files in a list of files or directories.
+
+    Args:
+        paths : A list of strings that specify files or directories. Files
+            that do not end with `.py` are ignored.
+        jobs : The number of worker processes to use. Defaults to the number
+            of processors. Set to `1` to check the files in this process.
+
+    Returns:
+        list: The problems found (see `check_file`), in the order of the files
+            and their line numbers.
+
+    """
+    from .index import source_files
+    files = []
+    for path in paths:
+        files.extend([f for f in source_files(path) if f.endswith('.py')])
+
+    if jobs == 1 or len(files) < 2:
+        results = [check_file(filename) for filename in files]
+    else:
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+        jobs = jobs or os.cpu_count() or 1
+        chunksize = max(1, len(files) // (4 * jobs))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(check_file, files,
+                                        chunksize=chunksize))
+
+    problems = []
+    for result in results:
+        problems.extend(result)
+    return problems
+
+def check_file(filename):
+    """
+    Checks a single file.
+
+    Returns:
+        list: A list of dictionaries with the keys `filename`, `lineno`,
+            `label`, and `message`.
+
+    """
+    with open(filename) as fh:
+        txt = fh.read()
+    return check_source(txt, filename)
+
+def check_source(txt, filename=''):
+    """
+    Checks source code (see `check_file`).
+    """
+    from .index import scan
+    problems = []
+    symbols = scan(txt, filename)
+    functions = set([symbol['label'] for symbol in symbols
+                     if symbol['type'] in ('function', 'method')])
+    for symbol in symbols:
+        message = check_symbol(symbol, functions)
+        if message:
+            problems.append({'filename' : filename,
+                             'lineno' : symbol['lineno'],
+                             'label' : symbol['label'],
+                             'message' : message})
+    return problems
+
+def check_symbol(symbol, functions=()):
+    """
+    Checks a single symbol.
+
+    Args:
+        symbol : A dictionary that describes a symbol (see `index.scan`).
+        functions : The labels of all functions and methods in the file. Used
+            to identify symbols that are nested in functions.
+
+    Returns:
+        A string that describes the problem, or `None` if there is none.
+
+    """
+    from . import parse
+    if symbol['type'] == 'module' or not is_public(symbol, functions):
+        return None
+    if symbol['docstring'] is None:
+        return 'missing docstring'
+    if symbol['type'] == 'class' or not _ARGS.search(symbol['docstring']):
+        return None
+
+    try:
+        sections = parse.parser(symbol['docstring'],
+                                filename=symbol['filename']).parse()
+    except (SyntaxError, ValueError) as err:
+        return 'invalid docstring: %s' % err
+
+    documented = None
+    for section in sections:
+        if section['header'] in ARGS:
+            documented = documented or []
+            documented.extend([arg['field'].lstrip('*')
+                               for arg in section['args'] if arg['field']])
+    if documented is None:
+        return None
+
+    params = arguments(symbol['signature'], symbol['type'] == 'method')
+    missing = [arg for arg in params if arg not in documented]
+    extra = [arg for arg in documented if arg not in params]
+    messages = []
+    if missing:
+        messages.append('undocumented arguments: %s' % ', '.join(missing))
+    if extra:
+        messages.append('unknown arguments: %s' % ', '.join(extra))
+    return '; '.join(messages) or None
+
+def is_public(symbol, functions=()):
+    """
+    Returns `True` if no part of the name of a symbol starts with an
+    underscore, and the symbol is not nested in any of `functions`.
+    """
+    parts = symbol['label'].split('.')
+    if any([part.startswith('_') for part in parts]):
+        return False
+    for i in range(1, len(parts)):
+        if '.'.join(parts[:i]) in functions:
+            return False
+    return True
+
+def arguments(signature, method=False):
+    """
+    Returns the names of the arguments in a signature. Leading `*` and `**`
+    are removed, and the bare `*` and `/` separators are skipped.
+
+    Args:
+        signature : A string such as `'(self, a, b=1, *args, **kwargs)'`.
+        method : Set to `True` to drop the first argument if it is `self` or
+            `cls`.
+
+    """
+    inner = signature.strip()[1:-1]
+    names = []
+    for arg in split_arguments(inner):
+        name = re.split(r'[:=]', arg, maxsplit=1)[0].strip()
+        name = name.lstrip('*').strip()
+        if name and name != '/':
+            names.append(name)
+    if method and names and names[0] in ('self', 'cls'):
+        names = names[1:]
+    return names
+
+def split_arguments(txt):
+    """
+    Splits a string at the commas that are not enclosed in brackets.
+    """
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(txt):
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(txt[start:i])
+            start = i + 1
+    parts.append(txt[start:])
+    return parts
@@ -26,6 +26,11 @@ The command module handles the execution of the user-supplied commands via the
 command-line interface (main application). In particular, this module takes the
 parsed docstrings and outputs them to plain-text, markdown, or json.
 """
+import os
+
+TEMPLATE = os.path.join(os.path.dirname(__file__),
+                        'templates/google_docstring.md')
+
 class Command(object):
     """
     Executes the commands provided on the command line.
@@ -33,23 +38,41 @@ class Command(object):
     """
 
     def __init__(self, options):
-        import os
-        from . import extract
-        from . import parse
         self.filename = options['<file>']
+        self.arguments = options
         self.options = {}
 
         if options['--version']:
             self.version()
             return
 
-        if options['<name>'] == '.':
+        commands = {'index' : self.build_index,
+                    'merge' : self.merge,
+                    'search' : self.search,
+                    'check' : self.check,
+                    'diff' : self.diff,
+                    'render' : self.render}
+        for name in commands:
+            if options.get(name):
+                self.options = {name : commands[name]}
+                return
+
+        self.inherit = options.get('--inherit')
+        self._extractor = None
+        self._docstring = None
+        self._parser = None
+        self._symbol = None
+        if options.get('--line'):
+            self._symbol = self.symbol_at(int(options['--line']))
+            self.name = self._symbol['label']
+        elif options['<name>'] == '.':
             self.name = ''
         else:
             self.name = options['<name>']
-        self.docstring = extract.extract(self.filename, self.name)
-        self.parser = parse.parser(self.docstring['docstring'], 'Google')
-        self.parser.parse()
+        if os.path.isdir(self.filename):
+            from . import imports
+            self.filename, self.name = imports.resolve(self.filename,
+                                                       self.name)
         self.options = {'--text' : self.text,
                         '--markdown' : self.markdown,
                         '--json' : self.json
@@ -61,8 +84,64 @@ class Command(object):
             self.template = ''
 
         if not self.template:
-            self.template = os.path.join(os.path.dirname(__file__),
-                                         'templates/google_docstring.md')
+            self.template = TEMPLATE
+
+        self.xref = options.get('--xref')
+
+    @property
+    def docstring(self):
+        """
+        The extracted docstring (see `extract.extract`). The docstring is
+        extracted when it is first needed, so that commands that do not need
+        it do not pay for importing or running the extractor.
+        """
+        if self._docstring is None:
+            if self._symbol is not None:
+                self._docstring = self.extractor.extract_symbol(self._symbol)
+            else:
+                self._docstring = self.extractor.extract(self.name)
+        return self._docstring
+
+    @property
+    def extractor(self):
+        """
+        The extractor for the file, created when it is first needed.
+        """
+        if self._extractor is None:
+            from . import extract
+            self._extractor = extract.extractor(self.filename,
+                                                inherit=self.inherit)
+        return self._extractor
+
+    @property
+    def parser(self):
+        """
+        The parsed docstring. Plain-text output does not need it, so it is
+        only parsed when first needed.
+        """
+        if self._parser is None:
+            from . import parse
+            self._parser = parse.parser(self.docstring['docstring'], 'Google',
+                                        self.filename)
+            self._parser.parse()
+        return self._parser
+
+    def symbol_at(self, lineno):
+        """
+        Returns the innermost class, function, or method with a docstring that
+        contains a line. If none of them has a docstring, the module is
+        returned. The symbol is taken from the index (see `FileIndex.at`), so
+        nested definitions are found as well.
+
+        Raises:
+            NameError: This exception is raised if no docstring applies to
+                the line, i.e., not even the module has one.
+
+        """
+        symbol = self.extractor.index.at(lineno, docstring=True)
+        if symbol is None:
+            raise NameError('No docstring applies to line %d' % lineno)
+        return symbol
 
     def __call__(self, cmd):
         """
@@ -79,35 +158,139 @@ class Command(object):
         """
         Output docstring as plain-text.
         """
-        txt = ''
-        if self.docstring['class']:
-            txt += self.docstring['class']
-            if self.docstring['function']:
-                txt += '.'
-        for prop in ['function', 'signature']:
-            if prop in self.docstring:
-                txt += self.docstring[prop]
-        txt += self.docstring['docstring']
+        from . import profile
+        # Extract before the render phase starts, so that it only measures
+        # rendering (phases must not be nested).
+        docstring = self.docstring
+        with profile.phase('render', self.filename):
+            txt = format_text(docstring)
         print(txt)
 
     def markdown(self):
         """
         Output docstring as markdown using a template.
         """
-        from mako.template import Template
-        template = Template(filename=self.template)
-        hd1 = '#'
-        hd2 = '##'
-        hd3 = '###'
+        from . import profile
+        docstring = self.docstring
         headers, data = self.parser.markdown()
-        print(template.render(header=self.docstring, sections=data,
-                              headers=headers, h1=hd1, h2=hd2, h3=hd3))
+        if self.xref:
+            data = self.link(data)
+        with profile.phase('render', self.filename):
+            txt = format_markdown(load_template(self.template), docstring,
+                                  headers, data)
+        print(txt)
+
+    def link(self, data):
+        """
+        Links names in backticks to the symbols defined in the package
+        specified by `--xref`.
+        """
+        from . import index
+        from . import profile
+        from . import xref
+        with profile.phase('index', self.xref):
+            table = index.SymbolTable.from_package(self.xref)
+        return xref.link(data, table)
 
     def json(self):
         """
         Output docstring as JSON data.
         """
-        print(self.parser.__json__())
+        from . import profile
+        parser = self.parser
+        with profile.phase('render', self.filename):
+            txt = parser.__json__()
+        print(txt)
+
+    def build_index(self):
+        """
+        Build or update the search index.
+        """
+        from . import search
+        filename = self.arguments['<index>']
+        shard = self.arguments.get('--shard')
+        index = search.SearchIndex.load(filename)
+        index.update(self.arguments['<path>'],
+                     search.parse_shard(shard) if shard else None)
+        index.save(filename)
+
+    def merge(self):
+        """
+        Combine partial search indexes into a single search index.
+        """
+        from . import search
+        index = search.SearchIndex()
+        for filename in self.arguments['<partial>']:
+            index.merge(search.SearchIndex.load(filename))
+        index.save(self.arguments['<index>'])
+
+    def search(self):
+        """
+        Output the docstrings in the search index that match the query.
+        """
+        from . import search
+        index = search.SearchIndex.load(self.arguments['<index>'])
+        for hit in index.search(self.arguments['<query>']):
+            print('%s:%d: %s [%s] %s' % (hit['filename'], hit['lineno'],
+                                         hit['label'] or '.', hit['section'],
+                                         hit['text'].split('\n')[0]))
+
+    def check(self):
+        """
+        Output docstring problems, and exit with a non-zero status if any are
+        found.
+        """
+        import sys
+        from . import check
+        jobs = self.arguments.get('--jobs')
+        problems = check.check(self.arguments['<path>'],
+                               int(jobs) if jobs else None)
+        for problem in problems:
+            print('%s:%d: %s: %s' % (problem['filename'], problem['lineno'],
+                                     problem['label'], problem['message']))
+        if problems:
+            sys.exit(1)
+
+    def diff(self):
+        """
+        Output the symbols that have been added, removed, or changed between
+        two source trees, as plain-text or JSON data (`--json`).
+        """
+        import json
+        from . import diff
+        result = diff.diff(self.arguments['<old>'], self.arguments['<new>'])
+        if self.arguments.get('--json'):
+            print(json.dumps(result, sort_keys=True, indent=4,
+                             separators=(',', ': ')))
+        else:
+            txt = diff.format_text(result)
+            if txt:
+                print(txt)
+
+    def render(self):
+        """
+        Output the docstrings of all symbols in the given files or
+        directories using a pipeline of overlapping stages (see `pipeline`).
+        """
+        import json
+        import sys
+        from . import pipeline
+        fmt = 'text'
+        if self.arguments['--markdown']:
+            fmt = 'markdown'
+        elif self.arguments['--json']:
+            fmt = 'json'
+        template = self.arguments['--template']
+        jobs = self.arguments.get('--jobs')
+        stats = pipeline.run(self.arguments['<path>'],
+                             output=self.arguments.get('--output'), fmt=fmt,
+                             template=template[1:] if template else None,
+                             readers=int(self.arguments['--readers']),
+                             jobs=int(jobs) if jobs else None,
+                             queue_size=int(self.arguments['--queue-size']))
+        if self.arguments.get('--stats'):
+            sys.stderr.write(json.dumps(stats, sort_keys=True, indent=4,
+                                        separators=(',', ': ')) + '\n')
 
     def version(self):
         """
@@ -115,3 +298,39 @@ class Command(object):
         """
         from . import version
         print(version.__VERSION__)
+
+def format_text(docstring):
+    """
+    Formats an extracted docstring (see `extract.extract`) as plain-text.
+    """
+    txt = ''
+    if docstring['class']:
+        txt += docstring['class']
+        if docstring['function']:
+            txt += '.'
+    for prop in ['function', 'signature']:
+        if prop in docstring:
+            txt += docstring[prop]
+    txt += docstring['docstring']
+    return txt
+
+def load_template(filename=TEMPLATE):
+    """
+    Loads a Mako template for Markdown output.
+    """
+    from mako.template import Template
+    return Template(filename=filename)
+
+def format_markdown(template, docstring, headers, sections):
+    """
+    Formats a parsed docstring as Markdown.
+
+    Args:
+        template : The template returned by `load_template`.
+        docstring : The extracted docstring (see `extract.extract`).
+        headers : The section headers (see `DocString.markdown`).
+        sections : The parsed sections.
+
+    """
+    return template.render(header=docstring, sections=sections,
+                           headers=headers, h1='#', h2='##', h3='###')
@@ -0,0 +1,217 @@
+"""
+This module compares the docstrings of two versions of a source tree. A tree
+can be a directory, an archive (`.zip`, `.whl`, `.tar`, `.tar.gz`, `.tgz`,
+`.tar.bz2`), or a single file.
+
+The comparison is done in two steps to keep its cost proportional to the
+number of changes. First, the contents of each file are hashed, and files
+that are identical in both trees are skipped. Second, the symbols of the
+remaining files are indexed and each symbol is hashed by its signature and
+docstring. Only the symbols whose hashes differ are parsed to find out what
+changed.
+"""
+import hashlib
+
+ARCHIVES = ('.zip', '.whl', '.tar', '.tar.gz', '.tgz', '.tar.bz2')
+
+def diff(old, new):
+    """
+    Compares the docstrings of two source trees.
+
+    Args:
+        old : A string that specifies the old directory, archive, or file.
+        new : A string that specifies the new directory, archive, or file.
+
+    Returns:
+        dict: A dictionary with the following keys:
+            * `added` : Symbols that only exist in `new`.
+            * `removed` : Symbols that only exist in `old`.
+            * `changed` : Symbols whose signature or docstring has changed.
+        Each symbol is described by a dictionary with the keys `filename`
+        (relative to the root of the tree) and `label`. Changed symbols also
+        hold the keys `changes` (a list containing `'signature'` and/or
+        `'docstring'`), `args` (a dictionary with the keys `added` and
+        `removed` that lists the arguments added to or removed from the
+        signature), and `documented` (the same for the `Args` section).
+
+    """
+    old_files = read_tree(old)
+    new_files = read_tree(new)
+    if _is_source_file(old) and _is_source_file(new):
+        old_files = dict([(name, old_files.popitem()[1])
+                          for name in new_files])
+
+    out = {'added' : [], 'removed' : [], 'changed' : []}
+    for filename in sorted(set(old_files) | set(new_files)):
+        old_file = old_files.get(filename)
+        new_file = new_files.get(filename)
+        if old_file and new_file and old_file[0] == new_file[0]:
+            continue
+        old_symbols = _symbols(filename, old_file)
+        new_symbols = _symbols(filename, new_file)
+        for label in _ordered(old_symbols, new_symbols):
+            if label not in new_symbols:
+                out['removed'].append({'filename' : filename, 'label' : label})
+            elif label not in old_symbols:
+                out['added'].append({'filename' : filename, 'label' : label})
+            elif old_symbols[label][0] != new_symbols[label][0]:
+                change = compare(old_symbols[label][1], new_symbols[label][1])
+                change['filename'] = filename
+                change['label'] = label
+                out['changed'].append(change)
+    return out
+
+def compare(old, new):
+    """
+    Describes the differences between two versions of a symbol.
+
+    Args:
+        old : A dictionary that describes the old symbol (see `index.scan`).
+        new : A dictionary that describes the new symbol.
+
+    Returns:
+        dict: A dictionary with the keys `changes`, `args`, and `documented`
+            (see `diff`).
+
+    """
+    from .check import arguments
+    changes = []
+    if old['signature'] != new['signature']:
+        changes.append('signature')
+    if old['docstring'] != new['docstring']:
+        changes.append('docstring')
+    method = new['type'] == 'method'
+    return {'changes' : changes,
+            'args' : _compare_lists(arguments(old['signature'], method),
+                                    arguments(new['signature'], method)),
+            'documented' : _compare_lists(documented_args(old),
+                                          documented_args(new))}
+
+def documented_args(symbol):
+    """
+    Returns the names of the arguments listed in the `Args` section of the
+    docstring of a symbol.
+    """
+    from . import parse
+    from .check import ARGS
+    if not symbol['docstring']:
+        return []
+    try:
+        sections = parse.parser(symbol['docstring'],
+                                filename=symbol['filename']).parse()
+    except (SyntaxError, ValueError):
+        return []
+    return [arg['field'] for section in sections
+            if section['header'] in ARGS
+            for arg in section['args'] if arg['field']]
+
+def read_tree(path):
+    """
+    Reads all `.py` files of a directory, archive, or file.
+
+    Returns:
+        dict: A dictionary that maps the filename (relative to the root of the
+            tree) to a tuple containing the hash of the contents and the
+            contents (bytes).
+
+    """
+    import os
+    files = {}
+    if os.path.isdir(path):
+        from .index import source_files
+        for filename in source_files(path):
+            with open(filename, 'rb') as fh:
+                files[os.path.relpath(filename, path)] = fh.read()
+    elif path.endswith(('.zip', '.whl')):
+        import zipfile
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith('.py'):
+                    files[name] = archive.read(name)
+        # Wheels hold the packages at the top level.
+        if not path.endswith('.whl'):
+            files = _strip_root(files)
+    elif path.endswith(ARCHIVES):
+        import tarfile
+        with tarfile.open(path) as archive:
+            for member in archive.getmembers():
+                if member.isfile() and member.name.endswith('.py'):
+                    files[member.name] = archive.extractfile(member).read()
+        files = _strip_root(files)
+    else:
+        with open(path, 'rb') as fh:
+            files[os.path.basename(path)] = fh.read()
+    return dict([(name, (hashlib.sha1(data).hexdigest(), data))
+                 for name, data in files.items()])
+
+def _is_source_file(path):
+    import os
+    return os.path.isfile(path) and not path.endswith(ARCHIVES)
+
+def _symbols(filename, entry):
+    """
+    Returns a dictionary that maps the label of each symbol in a file to a
+    tuple containing the hash of the symbol and the symbol.
+    """
+    from .index import FileIndex
+    if not entry:
+        return {}
+    txt = entry[1].decode('utf-8', 'replace')
+    out = {}
+    for symbol in FileIndex.from_source(txt, filename).symbols:
+        digest = hashlib.sha1(('%s\0%s' % (symbol['signature'],
+                                           symbol['docstring'])
+                              ).encode('utf-8')).hexdigest()
+        out.setdefault(symbol['label'], (digest, symbol))
+    return out
+
+def _ordered(old, new):
+    """
+    Returns the labels of `old` and `new` ordered by line number.
+    """
+    labels = dict([(label, old[label][1]['lineno']) for label in old])
+    labels.update([(label, new[label][1]['lineno']) for label in new])
+    return sorted(labels, key=lambda label: (labels[label], label))
+
+def _compare_lists(old, new):
+    return {'added' : [item for item in new if item not in old],
+            'removed' : [item for item in old if item not in new]}
+
+def _strip_root(files):
+    """
+    Removes the top-level directory from the names of archive members if all
+    members share it and it is a wrapper such as `package-1.0/` in a source
+    distribution. A top-level directory whose name is a valid module name may
+    be a package, and is kept.
+    """
+    roots = set([name.split('/', 1)[0] for name in files])
+    if len(roots) != 1 or not all(['/' in name for name in files]):
+        return files
+    if roots.pop().isidentifier():
+        return files
+    return dict([(name.split('/', 1)[1], data)
+                 for name, data in files.items()])
+
+def format_text(result):
+    """
+    Formats the result of `diff` as plain-text, one symbol per line. Added
+    symbols are marked by `+`, removed by `-`, and changed by `~`.
+    """
+    lines = []
+    for mark, key in [('+', 'added'), ('-', 'removed')]:
+        for item in result[key]:
+            lines.append('%s %s' % (mark, _name(item)))
+    for item in result['changed']:
+        details = list(item['changes'])
+        for key in ['args', 'documented']:
+            names = (['+' + arg for arg in item[key]['added']] +
+                     ['-' + arg for arg in item[key]['removed']])
+            if names:
+                details.append('%s: %s' % (key, ' '.join(names)))
+        lines.append('~ %s (%s)' % (_name(item), ', '.join(details)))
+    return '\n'.join(lines)
+
+def _name(item):
+    if item['label']:
+        return '%s:%s' % (item['filename'], item['label'])
+    return item['filename']
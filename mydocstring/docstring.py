@@ -2,7 +2,17 @@
 mydocstring
 
 Usage:
-  mydocstring <file> <name> [-tmj] [-T=<tpl>]
+  mydocstring index <index> <path>... [--shard=<i/n>]
+  mydocstring merge <index> <partial>...
+  mydocstring search <index> <query>
+  mydocstring check <path>... [--jobs=<n>]
+  mydocstring diff <old> <new> [-j]
+  mydocstring render <path>... [-tmj] [-T=<tpl>] [--output=<dir>]
+              [--readers=<n>] [--jobs=<n>] [--queue-size=<n>] [--stats]
+  mydocstring <file> <name> [-tmj] [-T=<tpl>] [--xref=<pkg>] [--inherit]
+              [--profile] [--profile-memory] [--startup-report]
+  mydocstring <file> --line=<n> [-tmj] [-T=<tpl>] [--xref=<pkg>] [--inherit]
+              [--profile] [--profile-memory] [--startup-report]
   mydocstring -h | --help
   mydocstring --version
 
@@ -13,6 +23,32 @@ Options:
   -t --text                         Output extracted docstring as plain-text.
   -j --json                         Output extracted docstring as JSON.
   -T=<tpl> --template=<tpl>         Set template for Markdown output.
+  --xref=<pkg>                      Link names in backticks to the symbols
+                                    defined in the package directory <pkg>
+                                    (Markdown output only).
+  --line=<n>                        Extract the docstring that applies to line
+                                    <n>, i.e., of the innermost enclosing
+                                    class or function that has one.
+  --inherit                         Take the docstring of a method without a
+                                    docstring from its base classes.
+  --shard=<i/n>                     Only index shard <i> of <n> (1 <= i <= n).
+  --jobs=<n>                        Number of worker processes to use.
+  --output=<dir>                    Write one output file per source file to
+                                    the directory <dir> instead of stdout.
+  --readers=<n>                     Number of threads that read files
+                                    [default: 4].
+  --queue-size=<n>                  Maximum number of files waiting between
+                                    two stages [default: 16].
+  --stats                           Report throughput and queue depth of each
+                                    stage, and the docstrings that cannot be
+                                    parsed, as JSON data (written to stderr).
+  --profile                         Report time spent in each phase as JSON
+                                    data (written to stderr).
+  --profile-memory                  Also report peak memory usage of each
+                                    phase (implies --profile).
+  --startup-report                  Report the time spent starting the
+                                    interpreter and importing each module
+                                    (written to stderr).
 
 Examples:
   Extract the module docstring
@@ -23,22 +59,60 @@ Examples:
     mydocstring module.py Class --markdown
   Extract a method docstring
     mydocstring module.py Class.method --markdown
+  Extract the docstring of a name that a package re-exports in __init__.py
+    mydocstring src/ package.Class.method --markdown
+  Extract the docstring that applies to line 120
+    mydocstring module.py --line=120 --text
+  Link references to other symbols in the package
+    mydocstring module.py function --markdown --xref=package/
+  Build or update a search index, and search it
+    mydocstring index docs.idx package/
+    mydocstring search docs.idx "parse arguments"
+  Build the search index on two machines and combine the results
+    mydocstring index part1.idx package/ --shard=1/2
+    mydocstring index part2.idx package/ --shard=2/2
+    mydocstring merge docs.idx part1.idx part2.idx
+  Check docstrings of changed files (e.g., in a pre-commit hook)
+    mydocstring check $(git diff --cached --name-only)
+  Output the docstrings of a whole package as Markdown files
+    mydocstring render package/ --markdown --output=docs/ --stats
+  Compare the docstrings of two releases
+    mydocstring diff package-1.0.tar.gz package-1.1.tar.gz
+  Report where time is spent
+    mydocstring module.py Class.method --markdown --profile
+    mydocstring module.py Class.method --text --startup-report
 
 Help:
   Please see the issue tracker for the Github repository:
   https://github.com/ooreilly/docstringout
 """
-from docopt import docopt
 from . import command
+from . import profile
 
 def main():
     """
     Program main
     """
+    from docopt import docopt
     options = docopt(__doc__)
+    if options.get('--startup-report'):
+        import sys
+        from . import startup
+        startup.report([arg for arg in sys.argv[1:]
+                        if arg != '--startup-report'])
+        return
+
+    profiler = None
+    if options.get('--profile') or options.get('--profile-memory'):
+        profiler = profile.enable(memory=options.get('--profile-memory'))
+
     cmd = command.Command(options)
 
     for opt in options:
         if options[opt]:
             cmd(opt)
 
+    if profiler:
+        profile.disable()
+        profiler.emit()
+
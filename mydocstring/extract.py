@@ -25,6 +25,8 @@ SOFTWARE.
 This module is used to extract a docstring from source.
 """
 import re
+from collections.abc import MutableMapping
+from . import profile
 
 class Extract(object):
     """
@@ -42,25 +44,61 @@ class Extract(object):
         funcname : Holds the function or method name of the query.
         dtype : Holds the type of the query `module`, `class`, `method`, or
             `function`.
+        inherit : A bool that enables resolving the docstrings of methods
+            without a docstring through their base classes (see `inherit`).
 
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, source=None, inherit=False):
         """
         Initializer for Extract.
 
         Arguments:
             filename: A string that that specifies the file to extract
                 docstrings from.
+            source: A string or bytes that contains the source code. If
+                given, `filename` is not read and is only used for reporting.
+            inherit: Set to `True` to resolve method docstrings through base
+                classes.
 
         """
-        self.txt = open(filename).read()
+        if source is None:
+            with profile.phase('read', filename):
+                with open(filename, 'rb') as fh:
+                    source = fh.read()
+        if isinstance(source, bytes):
+            source = source.decode('utf-8')
+        self.txt, self._crlf = _split_newlines(source)
         self.filename = filename
         self.query = ''
         self.classname = ''
         self.funcname = ''
         self.dtype = ''
+        self.inherit = inherit
+        self._ascii = None
+        self._line_starts = None
 
+    @classmethod
+    def from_source(cls, source, filename='<string>'):
+        """
+        Constructs an extractor for source code that is held in memory, e.g.,
+        an unsaved editor buffer.
+
+        Arguments:
+            source: A string or bytes (UTF-8) that contains the source code.
+            filename: A virtual filename that is used for reporting.
+
+        """
+        return cls(filename, source)
+
+    @property
+    def index(self):
+        """
+        The `FileIndex` of the source. Indexes are cached by content (see
+        `index.get`), so extractors for identical source share an index.
+        """
+        from . import index
+        return index.get(self.filename, self.txt)
 
     def extract(self, query):
         """
@@ -83,7 +121,48 @@ class Extract(object):
                  'function' : self.extract_function,
                  'module' : self.extract_module}
 
-        return types[self.dtype]()
+        if self.inherit and self.dtype == 'method':
+            symbol = self.index.names.get(query)
+            if symbol is not None and symbol['docstring'] is None:
+                return self.extract_inherited()
+
+        try:
+            return types[self.dtype]()
+        except NameError:
+            if not (self.inherit and self.dtype == 'method'):
+                raise
+            return self.extract_inherited()
+
+    def extract_inherited(self):
+        """
+        Extracts the docstring of a method from the first base class that
+        defines the method with a docstring. The keys `class` and `label`
+        refer to the query, and all other keys to the method in the base class.
+        In addition, the key `inherited` holds the label of that method (e.g.,
+        `Base.method`).
+
+        Returns:
+            A dictionary that matches the description given by `Extract.find`.
+
+        Raises:
+            NameError: This is exception is raised if the class is not found,
+                or none of its base classes defines the method with a
+                docstring.
+        """
+        from . import inherit
+        with profile.phase('inherit', self.filename):
+            resolver = inherit.resolver(self.filename)
+            fileindex, symbol = resolver.resolve(self.index, self.classname,
+                                                 self.funcname)
+        if fileindex.filename == self.filename:
+            base = self
+        else:
+            base = extractor(fileindex.filename)
+        out = base.extract_symbol(symbol)
+        out['class'] = self.classname
+        out['label'] = self.query
+        out['inherited'] = symbol['label']
+        return out
 
     def extract_function(self):
         """
@@ -131,7 +210,7 @@ class Extract(object):
         Performs a search for a docstring that matches a specific pattern.
 
         Returns:
-            dict: The return type is a dictionary with the following keys:
+            Match: The return type is a mapping with the following keys:
                  * `class` :  The name of the class.
                  * `function` : The name of the function/method.
                  * `signature` : The signature of the function/method.
@@ -142,39 +221,267 @@ class Extract(object):
                  * `label` : The search query string.
                  * `filename` : The filename of source to extract docstrings from.
                  * `source` : The source code if the query is a function/method.
+                      The source code is only constructed when this key is
+                      read (see `Match`).
+                 * `lineno`, `end_lineno` : The first and last line (1-based)
+                      of the definition.
+                 * `offset`, `end_offset` : The byte offsets of the start and
+                      end of the definition.
+                 * `docstring_lineno`, `docstring_end_lineno` : The first and
+                      last line of the docstring, including the quotes.
+                 * `docstring_offset`, `docstring_end_offset` : The byte
+                      offsets of the start and end of the docstring, including
+                      the quotes.
 
         Raises:
             NameError: This is exception is raised if the docstring cannot be
                 extracted.
         """
-        import textwrap
-        matches = re.compile(pattern, re.M).findall(self.txt)
-        if not matches:
+        with profile.phase('extract', self.filename):
+            match = re.compile(pattern, re.M).search(self.txt)
+        if not match:
             raise NameError(r'Unable to extract docstring for `%s`' % self.query)
+
+        # Groups that did not participate in the match are returned as ''
+        groups = match.groups('')
+        indent = len(groups[3])
+        docstring = remove_indent(groups[4], indent)
+        doc_start = match.start(5) - 3
+        doc_end = match.end(5) + 3
+
+        body = None
+        if self.dtype == 'function' or self.dtype == 'method':
+            if match.start(6) >= 0:
+                body = (match.start(6), match.end(6))
+            else:
+                body = (doc_end, doc_end)
+
+        if self.dtype == 'module':
+            start = doc_start
+            end = doc_end
         else:
+            name = 1 if self.dtype == 'class' else 2
+            start = self.txt.rfind('\n', 0, match.start(name)) + 1
+            if body:
+                end = body[1]
+            else:
+                end = _block_end(self.txt, doc_end, indent)
+        while end > doc_end and self.txt[end - 1].isspace():
+            end -= 1
+
+        lineno = self.txt.count('\n', 0, start) + 1
+        doc_lineno = lineno + self.txt.count('\n', start, doc_start)
+        doc_end_lineno = doc_lineno + self.txt.count('\n', doc_start, doc_end)
+        end_lineno = doc_end_lineno + self.txt.count('\n', doc_end, end)
+
+        out = Match()
+        out['class'] = groups[0]
+        out['function'] = groups[1]
+        out['signature'] = groups[2]
+        out['docstring'] = docstring
+        out['type'] = self.dtype
+        out['label'] = self.query
+        out['filename'] = self.filename
+        out['lineno'] = lineno
+        out['end_lineno'] = end_lineno
+        out['offset'] = self.byte_offset(start)
+        out['end_offset'] = self.byte_offset(end)
+        out['docstring_lineno'] = doc_lineno
+        out['docstring_end_lineno'] = doc_end_lineno
+        out['docstring_offset'] = self.byte_offset(doc_start)
+        out['docstring_end_offset'] = self.byte_offset(doc_end)
+        if body:
+            out.lazy('source', _Source(self.txt, groups[1], groups[2], body))
+        else:
+            out['source'] = ''
+        return out
+
+    def extract_symbol(self, symbol):
+        """
+        Constructs the dictionary returned by `Extract.find` for a symbol that
+        has been found by indexing the source (see `index.scan`), without
+        searching for it again. Unlike `find`, this works for any symbol the
+        index finds, including nested definitions and classes with dotted or
+        multiple bases.
+
+        Arguments:
+            symbol : A dictionary that describes a symbol with a docstring,
+                taken from the index of this extractor (see `Extract.index`).
+
+        Returns:
+            A dictionary that matches the description given by `Extract.find`.
+
+        Raises:
+            NameError: This exception is raised if the docstring of the symbol
+                is not found in the source, e.g., because the symbol was
+                indexed before the file changed.
+
+        """
+        from .index import _DOCSTRING
+        starts = self.line_starts()
+        doc_line = symbol['docstring_lineno'] - 1
+        match = None
+        if 0 <= doc_line < len(starts):
+            line = self.txt[starts[doc_line]:self.txt.find('\n',
+                                                            starts[doc_line])]
+            match = _DOCSTRING.match(line)
+        if match is None:
+            raise NameError('Unable to find the docstring of `%s` at line %d'
+                            ' of %s' % (symbol['label'] or '.', doc_line + 1,
+                                        self.filename))
+        doc_start = starts[doc_line] + match.start(2)
+        doc_end = self.txt.find(match.group(2), doc_start + 3) + 3
+        doc_end_lineno = doc_line + 1 + self.txt.count('\n', doc_start,
+                                                       doc_end)
+        if symbol['type'] == 'module':
+            start, end = doc_start, doc_end
+            lineno, end_lineno = doc_line + 1, doc_end_lineno
+        else:
+            start = starts[symbol['lineno'] - 1]
+            end = self.txt.find('\n', starts[symbol['end_lineno'] - 1])
+            if end < 0:
+                end = len(self.txt)
+            lineno, end_lineno = symbol['lineno'], symbol['end_lineno']
+        while end > doc_end and self.txt[end - 1].isspace():
+            end -= 1
+
+        out = Match()
+        for key in ['class', 'function', 'signature', 'docstring', 'type',
+                    'label']:
+            out[key] = symbol[key]
+        out['filename'] = self.filename
+        out['lineno'] = lineno
+        out['end_lineno'] = end_lineno
+        out['offset'] = self.byte_offset(start)
+        out['end_offset'] = self.byte_offset(end)
+        out['docstring_lineno'] = doc_line + 1
+        out['docstring_end_lineno'] = doc_end_lineno
+        out['docstring_offset'] = self.byte_offset(doc_start)
+        out['docstring_end_offset'] = self.byte_offset(doc_end)
+        if symbol['type'] in ('function', 'method'):
+            body = self.txt.find('\n', doc_end) + 1
+            if body <= 0 or body > end:
+                body = doc_end
+            # Like `find`, include the newlines that follow the body.
+            body_end = max(body, end)
+            while self.txt[body_end:body_end + 1] == '\n':
+                body_end += 1
+            out.lazy('source', _Source(self.txt, symbol['function'],
+                                       symbol['signature'],
+                                       (body, body_end)))
+        else:
+            out['source'] = ''
+        return out
+
+    def line_starts(self):
+        """
+        Returns the positions in `txt` at which each line starts.
+        """
+        if self._line_starts is None:
+            starts = [0]
+            pos = self.txt.find('\n')
+            while pos >= 0:
+                starts.append(pos + 1)
+                pos = self.txt.find('\n', pos + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def byte_offset(self, pos):
+        """
+        Converts a character position in `txt` to a byte offset in the UTF-8
+        encoded source, counting two bytes for each line that ends with
+        `\\r\\n` in the source.
+        """
+        import bisect
+        if self._ascii is None:
+            self._ascii = self.txt.isascii()
+        offset = pos
+        if not self._ascii:
+            offset = len(self.txt[:pos].encode('utf-8'))
+        if self._crlf:
+            offset += bisect.bisect_left(self._crlf, pos)
+        return offset
+
+class Match(MutableMapping):
+    """
+    Dictionary returned by `Extract.find`. Values that are expensive to
+    construct, such as `source`, can be registered using `Match.lazy` and are
+    only constructed the first time they are read. The keys of lazy values
+    are part of the mapping all along (e.g., `'source' in match` is `True`),
+    so only the cost is deferred. `Match` is not a `dict`; use `dict(match)`
+    or `Match.materialize` to get one, e.g., for `json.dumps`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._data = dict(*args, **kwargs)
+        self._lazy = {}
+
+    def lazy(self, key, func):
+        """
+        Registers a function without arguments that computes the value of
+        `key` when it is first read.
+        """
+        self._data[key] = None
+        self._lazy[key] = func
+
+    def __getitem__(self, key):
+        if key in self._lazy:
+            self._data[key] = self._lazy.pop(key)()
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._lazy.pop(key, None)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._lazy.pop(key, None)
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return 'Match(%r)' % self.materialize()
 
-            cls = matches[0][0]
-            function = matches[0][1]
-            signature = matches[0][2]
-            indent = len(matches[0][3])
-            docstring = remove_indent(matches[0][4], indent)
-            if self.dtype == 'function' or self.dtype == 'method': 
-                source = textwrap.dedent('def ' + function + signature + ':\n' +
-                                         matches[0][5]) 
-            else: 
-                source = ''
-
-            out = {}
-            out['class'] = cls
-            out['function'] = function
-            out['signature'] = signature
-            out['docstring'] = docstring
-            out['source'] = source
-            out['type'] = self.dtype
-            out['label'] = self.query
-            out['filename'] = self.filename
-
-            return out
+    def copy(self):
+        """
+        Returns a shallow copy. Lazy values that have not been read yet stay
+        lazy in the copy.
+        """
+        out = Match(self._data)
+        out._lazy = dict(self._lazy)
+        return out
+
+    def materialize(self):
+        """
+        Constructs all lazy values and returns a plain dictionary.
+        """
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (self.materialize(),))
+
+class _Source(object):
+    """
+    Constructs the source code of a function from its location in the file.
+    """
+
+    def __init__(self, txt, function, signature, body):
+        self.txt = txt
+        self.function = function
+        self.signature = signature
+        self.body = body
+
+    def __call__(self):
+        import textwrap
+        return textwrap.dedent('def ' + self.function + self.signature +
+                               ':\n' + self.txt[self.body[0]:self.body[1]])
 
 class PyExtract(Extract):
     """
@@ -201,28 +508,161 @@ class PyExtract(Extract):
         pattern = r'()()()()^"""([\w\W]*?)"""'
         return self.find(pattern)
 
+class NotebookExtract(PyExtract):
+    """
+    Class for extracting docstrings from the code cells of Jupyter notebooks
+    (`.ipynb`). The notebook is read incrementally and outputs are skipped
+    (see `notebook.code_cells`). The code cells are joined in order and
+    searched like python source code, so the line numbers and offsets of
+    `Extract.find` refer to the joined code. In addition, the results hold
+    the following keys:
+        * `cell` : The position of the cell in the notebook (0-based,
+            counting all cells).
+        * `cell_lineno`, `cell_end_lineno` : The first and last line of the
+            definition within the cell (1-based).
+
+    Attributes:
+        cells : A list of tuples containing the position of each code cell in
+            the notebook and the line in `txt` that it starts at.
 
-def extract(filestr, query):
     """
-    Extracts a docstring from source.
+
+    def __init__(self, filename, source=None, inherit=False):
+        """
+        Initializer for NotebookExtract.
+
+        Arguments:
+            filename: A string that that specifies the notebook to extract
+                docstrings from.
+            source: A string or bytes that contains the notebook (JSON data).
+                If given, `filename` is not read and is only used for
+                reporting.
+            inherit: Set to `True` to resolve method docstrings through base
+                classes.
+
+        """
+        import io
+        from . import notebook
+        if source is None:
+            fh = io.open(filename, encoding='utf-8')
+        elif isinstance(source, bytes):
+            fh = io.StringIO(source.decode('utf-8'))
+        else:
+            fh = io.StringIO(source)
+        code = []
+        self.cells = []
+        lineno = 1
+        with profile.phase('read', filename):
+            with fh:
+                for cell, txt in notebook.code_cells(fh):
+                    if not txt.endswith('\n'):
+                        txt += '\n'
+                    self.cells.append((cell, lineno))
+                    code.append(txt)
+                    lineno += txt.count('\n') + 1
+        super(NotebookExtract, self).__init__(filename, '\n'.join(code),
+                                              inherit)
+
+    def find(self, pattern):
+        return self._locate(super(NotebookExtract, self).find(pattern))
+
+    def extract_symbol(self, symbol):
+        return self._locate(super(NotebookExtract,
+                                  self).extract_symbol(symbol))
+
+    def _locate(self, out):
+        """
+        Adds the position of the cell that contains a result.
+        """
+        import bisect
+        starts = [start for _, start in self.cells]
+        i = bisect.bisect_right(starts, out['lineno']) - 1
+        if i >= 0:
+            cell, start = self.cells[i]
+            out['cell'] = cell
+            out['cell_lineno'] = out['lineno'] - start + 1
+            out['cell_end_lineno'] = out['end_lineno'] - start + 1
+        return out
+
+
+def _split_newlines(txt):
+    """
+    Converts the line endings of source code to `\\n`, like reading a file in
+    text mode does.
+
+    Returns:
+        tuple: A tuple containing the converted source, and a sorted list of
+            the positions in it of the newlines that were `\\r\\n`.
+
+    """
+    if '\r' not in txt:
+        return txt, []
+    lines = txt.split('\r\n')
+    crlf = []
+    pos = -1
+    for line in lines[:-1]:
+        pos += len(line) + 1
+        crlf.append(pos)
+    return '\n'.join(lines).replace('\r', '\n'), crlf
+
+EXTRACTORS = {'.py' : PyExtract, '.ipynb' : NotebookExtract}
+
+def extractor(filestr, source=None, inherit=False):
+    """
+    Returns a new extractor based on the file extension.
 
     Arguments:
         filestr: A string that specifies filename of the source code to extract
             from.
-        query: A string that specifies what type of docstring to extract.
+        source: A string or bytes that contains the source code. If given,
+            the file is not read. Sources without a known file extension are
+            treated as Python code.
+        inherit: Set to `True` to resolve method docstrings through base
+            classes.
+
+    Raises:
+        NotImplementedError : This exception is raised when no extractor is
+            found for the file extension.
 
     """
     import os
+    ext = os.path.splitext(filestr)[1]
+    if ext in EXTRACTORS:
+        return EXTRACTORS[ext](filestr, source, inherit)
+    if source is not None:
+        return PyExtract(filestr, source, inherit)
+    raise NotImplementedError('No extractor is implemented for `%s`' % filestr)
+
+def extract(filestr, query, inherit=False):
+    """
+    Extracts a docstring from source.
 
-    filename = os.path.splitext(filestr)
-    ext = filename[1]
+    Arguments:
+        filestr: A string that specifies filename of the source code to extract
+            from.
+        query: A string that specifies what type of docstring to extract.
+        inherit: Set to `True` to take the docstring of a method without a
+            docstring from its base classes, which can be defined in other
+            files of the same package.
 
-    options = {'.py' : PyExtract}
+    """
+    return extractor(filestr, inherit=inherit).extract(query)
 
-    if ext in options:
-        extractor = options[ext](filestr)
+def extract_source(source, query, filename='<string>', inherit=False):
+    """
+    Extracts a docstring from source code that is held in memory. No file is
+    read.
 
-    return extractor.extract(query)
+    Arguments:
+        source: A string or bytes (UTF-8) that contains the source code.
+        query: A string that specifies what type of docstring to extract.
+        filename: A virtual filename that is used for reporting, and for
+            selecting the extractor by its file extension.
+        inherit: Set to `True` to resolve method docstrings through base
+            classes.
+
+    """
+    return extractor(filename, source, inherit).extract(query)
 
 
 def get_names(query):
@@ -266,6 +706,26 @@ def get_names(query):
 
     return (classname, funcname, dtype)
 
+def _block_end(txt, pos, indent):
+    """
+    Returns the position of the end of the indented block that continues at
+    `pos`. Lines belong to the block if they are empty or are indented by at
+    least `indent` characters.
+    """
+    end = pos
+    num_chars = len(txt)
+    newline = txt.find('\n', pos)
+    while newline >= 0 and newline + 1 < num_chars:
+        start = newline + 1
+        newline = txt.find('\n', start)
+        line = txt[start:newline if newline >= 0 else num_chars]
+        if not line.strip():
+            continue
+        if len(line) - len(line.lstrip()) < indent:
+            break
+        end = start + len(line)
+    return end
+
 def remove_indent(txt, indent):
     """
     Dedents a string by a certain amount.
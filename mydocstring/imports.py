@@ -0,0 +1,206 @@
+"""
+This module resolves the public names of a package to the files that define
+them. Packages often define their public API by re-exporting names in their
+`__init__.py` files, e.g., `from ._impl import Foo`. A query such as
+`package.Foo.method` is resolved by following these import statements until
+the file that defines `Foo` is found.
+
+The import statements of each module are parsed once and cached in an
+`ImportMap`, and one map is kept per source root (see `get`).
+"""
+import re
+
+_FROM = re.compile(r'^[ \t]*from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+'
+                   r'(\([^)]*\)|(?:[^\n#\\]|\\\n)*)', re.M)
+
+_MAPS = {}
+
+class ImportMap(object):
+    """
+    Resolves names through the `from ... import ...` statements of the modules
+    in a source root.
+
+    Attributes:
+        root : A string that specifies the directory that contains the
+            top-level packages (i.e., the directory that would be on
+            `sys.path`).
+
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._imports = {}
+
+    def resolve(self, name):
+        """
+        Finds the file and label of a dotted name.
+
+        Args:
+            name : A string such as `package.Foo`, `package.Foo.method`, or
+                `package.module` (for the module docstring).
+
+        Returns:
+            tuple: A tuple containing the filename and the label to extract
+                from it (`''` for the module docstring).
+
+        Raises:
+            NameError: This exception is raised if the name cannot be
+                resolved.
+
+        """
+        return self._resolve(name, set())
+
+    def module_file(self, module):
+        """
+        Returns the file of a module (`package/module.py` or
+        `package/module/__init__.py`), or `None` if it does not exist.
+        """
+        import os
+        path = os.path.join(self.root, *module.split('.'))
+        for filename in [path + '.py', os.path.join(path, '__init__.py')]:
+            if os.path.isfile(filename):
+                return filename
+        return None
+
+    def imports(self, module):
+        """
+        Returns the names imported by a module. The result is cached.
+
+        Returns:
+            tuple: A tuple containing a dictionary that maps each imported
+                name to a tuple `(module, name)` of its origin, and a list of
+                the modules imported using `from module import *`.
+
+        """
+        if module not in self._imports:
+            filename = self.module_file(module)
+            txt = ''
+            if filename:
+                with open(filename) as fh:
+                    txt = fh.read()
+            package = module
+            if filename and not filename.endswith('__init__.py'):
+                package = module.rpartition('.')[0]
+            self._imports[module] = parse_imports(txt, package)
+        return self._imports[module]
+
+    def _resolve(self, name, visited):
+        from . import index
+        if name in visited:
+            raise NameError('Cyclic import while resolving `%s`' % name)
+        visited.add(name)
+
+        parts = name.split('.')
+        # Find the longest prefix of the name that is a module.
+        for i in range(len(parts), 0, -1):
+            module = '.'.join(parts[:i])
+            filename = self.module_file(module)
+            if filename:
+                break
+        else:
+            raise NameError('Unable to find a module for `%s`' % name)
+
+        rest = parts[i:]
+        if not rest:
+            return filename, ''
+        if rest[0] in index.get(filename).names:
+            return filename, '.'.join(rest)
+
+        names, stars = self.imports(module)
+        if rest[0] in names:
+            origin, original = names[rest[0]]
+            return self._resolve('.'.join([origin, original] + rest[1:]),
+                                 visited)
+        for origin in stars:
+            try:
+                return self._resolve('.'.join([origin] + rest), visited)
+            except NameError:
+                pass
+        raise NameError('Unable to resolve `%s`' % name)
+
+def parse_imports(txt, package=''):
+    """
+    Parses the `from ... import ...` statements of a module.
+
+    Args:
+        txt : A string that contains the source code of the module.
+        package : The package that relative imports are relative to.
+
+    Returns:
+        tuple: See `ImportMap.imports`.
+
+    """
+    names = {}
+    stars = []
+    for match in _FROM.finditer(txt):
+        origin = absolute(match.group(1), package)
+        imported = ' '.join([line.split('#', 1)[0] for line in
+                             match.group(2).split('\n')])
+        for item in imported.strip('()\\ \t').split(','):
+            item = item.strip('()\\ \t').split()
+            if not item:
+                continue
+            if item == ['*']:
+                stars.append(origin)
+            elif len(item) == 3 and item[1] == 'as':
+                names[item[2]] = (origin, item[0])
+            else:
+                names[item[0]] = (origin, item[0])
+    return names, stars
+
+def absolute(module, package):
+    """
+    Converts a module name that may be relative (e.g., `.._impl`) to an
+    absolute name, given the package that it is relative to.
+    """
+    level = len(module) - len(module.lstrip('.'))
+    if not level:
+        return module
+    parts = package.split('.') if package else []
+    if level > 1:
+        parts = parts[:len(parts) - (level - 1)]
+    if module[level:]:
+        parts.append(module[level:])
+    return '.'.join(parts)
+
+def source_root(path):
+    """
+    Returns the source root for a path. If `path` is a package directory
+    (contains `__init__.py`), the root is the directory that contains the
+    outermost package; otherwise `path` itself is the root.
+    """
+    import os
+    path = os.path.abspath(path)
+    while os.path.isfile(os.path.join(path, '__init__.py')):
+        path = os.path.dirname(path)
+    return path
+
+def get(path):
+    """
+    Returns the cached `ImportMap` for the source root of `path` (see
+    `source_root`).
+    """
+    root = source_root(path)
+    if root not in _MAPS:
+        _MAPS[root] = ImportMap(root)
+    return _MAPS[root]
+
+def resolve(path, name):
+    """
+    Resolves a dotted name to the file that defines it.
+
+    Args:
+        path : A string that specifies the source root or a package directory.
+        name : A string such as `package.Foo.method`.
+
+    Returns:
+        tuple: See `ImportMap.resolve`.
+
+    """
+    return get(path).resolve(name)
+
+def clear_cache():
+    """
+    Removes all cached import maps.
+    """
+    _MAPS.clear()
@@ -0,0 +1,521 @@
+"""
+This module builds indexes of the symbols (modules, classes, functions, and
+methods) defined in source files. A file is indexed in a single pass over its
+lines, which is much faster than running one `extract` query per symbol when
+many symbols are needed. Each symbol is described by a dictionary that uses
+the same keys as the dictionaries returned by `Extract.find`, and in addition
+holds the line span of the definition.
+
+Indexes are available at two levels:
+    * `FileIndex` : All symbols defined in a single file.
+    * `SymbolTable` : All symbols defined in a package, addressable by their
+      fully qualified name (e.g., `package.module.Class.method`) or by any
+      unambiguous suffix of it (e.g., `Class.method`).
+
+"""
+import re
+import threading
+from collections import OrderedDict
+
+CACHE_SIZE = 128
+
+_CACHE = OrderedDict()
+# `get` is called from several threads (e.g., by `aio`).
+_LOCK = threading.Lock()
+
+_DEF = re.compile(r'^([ \t]*)(?:async[ \t]+)?(def|class)[ \t]+(\w+)')
+_QUOTES = re.compile(r'"""|\'\'\'')
+_DOCSTRING = re.compile(r'^([ \t]*)[rRuU]?("""|\'\'\')')
+
+class FileIndex(object):
+    """
+    Index of all symbols defined in a single file.
+
+    Attributes:
+        filename : A string that specifies the file that has been indexed.
+        symbols : A list of dictionaries, one for each symbol, in the order of
+            appearance. The first symbol is always the module.
+        names : A dictionary that maps the label of each symbol (e.g.,
+            `Class.method`) to its dictionary.
+
+    """
+
+    def __init__(self, symbols, filename=''):
+        self.filename = filename
+        self.symbols = symbols
+        self.names = {}
+        for symbol in symbols:
+            self.names.setdefault(symbol['label'], symbol)
+        self._starts = None
+        self._owners = None
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        Builds an index by reading and scanning a file.
+        """
+        with open(filename) as fh:
+            txt = fh.read()
+        return cls.from_source(txt, filename)
+
+    @classmethod
+    def from_source(cls, txt, filename=''):
+        """
+        Builds an index by scanning source code.
+
+        Args:
+            txt : A string that contains the source code.
+            filename : The filename to use when reporting.
+
+        """
+        return cls(scan(txt, filename), filename)
+
+    def lookup(self, label):
+        """
+        Returns the symbol that matches a label.
+
+        Args:
+            label : The label to search for, e.g., `Class.method`, `function`,
+                or `''` for the module.
+
+        Raises:
+            NameError: This exception is raised if the symbol is not defined.
+
+        """
+        if label == '.':
+            label = ''
+        if label not in self.names:
+            raise NameError(r'Unable to find symbol `%s`' % label)
+        return self.names[label]
+
+    def at(self, lineno, docstring=False):
+        """
+        Returns the innermost symbol whose definition contains a line. Lines
+        outside of any class or function belong to the module. The lookup
+        uses binary search over the definition spans, which are flattened
+        into non-overlapping intervals the first time this method is called.
+
+        Args:
+            lineno : The line number (1-based).
+            docstring : Set to `True` to skip symbols without a docstring and
+                return the innermost enclosing symbol that has one.
+
+        Returns:
+            The dictionary of the symbol, or `None` if `docstring` is `True`
+            and no enclosing symbol has a docstring.
+
+        Raises:
+            ValueError: This exception is raised if `lineno` is less than 1.
+
+        """
+        import bisect
+        if lineno < 1:
+            raise ValueError('Invalid line number: `%s`' % lineno)
+        if self._starts is None:
+            self._build_intervals()
+        symbol = self._owners[bisect.bisect_right(self._starts, lineno) - 1]
+        while docstring and symbol is not None and symbol['docstring'] is None:
+            symbol = self.parent(symbol)
+        return symbol
+
+    def parent(self, symbol):
+        """
+        Returns the symbol that encloses a symbol, or `None` for the module.
+        """
+        if not symbol['label']:
+            return None
+        return self.names.get(symbol['label'].rpartition('.')[0])
+
+    def _build_intervals(self):
+        # Each interval starts at `starts[i]` and belongs to `owners[i]`.
+        starts = []
+        owners = []
+
+        def add(lineno, symbol):
+            if starts and starts[-1] == lineno:
+                owners[-1] = symbol
+            else:
+                starts.append(lineno)
+                owners.append(symbol)
+
+        module = self.symbols[0]
+        stack = [module]
+        add(1, module)
+        for symbol in self.symbols[1:]:
+            while (len(stack) > 1 and
+                   stack[-1]['end_lineno'] < symbol['lineno']):
+                add(stack.pop()['end_lineno'] + 1, stack[-1])
+            add(symbol['lineno'], symbol)
+            stack.append(symbol)
+        while len(stack) > 1:
+            add(stack.pop()['end_lineno'] + 1, stack[-1])
+        self._starts = starts
+        self._owners = owners
+
+class SymbolTable(object):
+    """
+    Index of all symbols defined in a package. Symbols can be looked up in
+    constant time by their fully qualified name or by any suffix of it that is
+    unambiguous. For example, `mydocstring.extract.Extract.find` can also be
+    found by looking up `Extract.find` or `extract.Extract.find`.
+
+    Attributes:
+        files : A dictionary that maps each module name to its `FileIndex`.
+
+    """
+
+    def __init__(self):
+        self.files = {}
+        self._names = {}
+
+    @classmethod
+    def from_package(cls, path):
+        """
+        Builds a symbol table for all `.py` files in a package directory.
+        Modules are named relative to the parent directory of `path`.
+
+        Args:
+            path : A string that specifies the package directory, or a single
+                source file.
+
+        """
+        import os
+        table = cls()
+        path = os.path.normpath(path)
+        root = os.path.dirname(path)
+        for filename in source_files(path):
+            table.add(filename, module_name(filename, root))
+        return table
+
+    def add(self, filename, module, index=None):
+        """
+        Adds all symbols of a file to the table.
+
+        Args:
+            filename : A string that specifies the file.
+            module : A string that specifies the module name of the file.
+            index : A `FileIndex` to use. The file is scanned if not given.
+
+        """
+        if index is None:
+            index = FileIndex.from_file(filename)
+        self.files[module] = index
+        for symbol in index.symbols:
+            qualname = module
+            if symbol['label']:
+                qualname = module + '.' + symbol['label']
+            self._register(qualname, (module, symbol))
+
+    def lookup(self, name):
+        """
+        Returns the symbol that matches a name.
+
+        Args:
+            name : A string that specifies a fully qualified name, or a suffix
+                of it.
+
+        Returns:
+            tuple: A tuple containing the module name and the dictionary of
+                the symbol, or `None` if the name is not found or ambiguous.
+
+        """
+        return self._names.get(name)
+
+    def __contains__(self, name):
+        return self._names.get(name) is not None
+
+    def __len__(self):
+        return sum([len(index.symbols) for index in self.files.values()])
+
+    def _register(self, qualname, entry):
+        # The fully qualified name always wins, suffixes that are shared by
+        # several symbols are marked as ambiguous by storing `None`.
+        self._names[qualname] = entry
+        parts = qualname.split('.')
+        for i in range(1, len(parts)):
+            suffix = '.'.join(parts[i:])
+            if suffix not in self._names:
+                self._names[suffix] = entry
+            elif self._names[suffix] is not entry and \
+                 not _is_qualname(self._names[suffix], suffix):
+                self._names[suffix] = None
+
+def _is_qualname(entry, name):
+    if entry is None:
+        return False
+    module, symbol = entry
+    if symbol['label']:
+        return name == module + '.' + symbol['label']
+    return name == module
+
+def get(filename, txt=None):
+    """
+    Returns the `FileIndex` of a file or of source code held in memory, using
+    a cache of recently built indexes. Files are cached by their modification
+    time and size, and source code by its contents, so that repeated queries
+    for the same file or buffer only scan it once.
+
+    Args:
+        filename : A string that specifies the file, or the virtual filename
+            of `txt`.
+        txt : A string that contains the source code. If given, the file is
+            not read.
+
+    """
+    import os
+    if txt is None:
+        stat = os.stat(filename)
+        key = (filename, stat.st_mtime, stat.st_size)
+    else:
+        key = (filename, len(txt), hash(txt))
+
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if entry and (txt is None or entry[0] == txt):
+            _CACHE.move_to_end(key)
+            return entry[1]
+
+    if txt is None:
+        index = FileIndex.from_file(filename)
+    else:
+        index = FileIndex.from_source(txt, filename)
+    with _LOCK:
+        _CACHE[key] = (txt, index)
+        while len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return index
+
+def clear_cache():
+    """
+    Removes all indexes from the cache used by `get`.
+    """
+    with _LOCK:
+        _CACHE.clear()
+
+def scan(txt, filename=''):
+    """
+    Finds all symbols in Python source code in a single pass.
+
+    Args:
+        txt : A string that contains the source code.
+        filename : The filename to store in each symbol.
+
+    Returns:
+        list: A list of dictionaries with the same keys as the dictionary
+            returned by `Extract.find` (except `source`), and the keys:
+                * `lineno` : First line of the definition (1-based).
+                * `end_lineno` : Last non-empty line of the definition.
+                * `docstring_lineno` : First line of the docstring, or `0` if
+                  there is no docstring.
+            The key `docstring` is set to `None` if there is no docstring.
+
+    """
+    lines = txt.split('\n')
+    num_lines = len(lines)
+    module = _symbol('', '', '', 'module', '', filename, 1)
+    module['end_lineno'] = _last_line(lines, num_lines)
+    _set_docstring(module, lines, _first_statement(lines, 0))
+    symbols = [module]
+
+    # Stack of open definitions as tuples (indent, symbol)
+    stack = []
+    quote = None
+    last = 0
+    i = 0
+    while i < num_lines:
+        line = lines[i]
+        if quote:
+            quote = _update_quote(line, quote)
+            last = i + 1
+            i += 1
+            continue
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            i += 1
+            continue
+
+        indent = _indent(line)
+        while stack and indent <= stack[-1][0]:
+            stack.pop()[1]['end_lineno'] = last
+
+        match = _DEF.match(line)
+        if not match:
+            quote = _update_quote(line, None)
+            last = i + 1
+            i += 1
+            continue
+
+        kind, name = match.group(2), match.group(3)
+        end, signature = _header(lines, i, match.end())
+        parent = stack[-1][1] if stack else None
+        symbol = _new_symbol(parent, kind, name, signature, filename, i + 1)
+        _set_docstring(symbol, lines, _first_statement(lines, end + 1))
+        symbols.append(symbol)
+        stack.append((indent, symbol))
+        last = end + 1
+        i = end + 1
+
+    while stack:
+        stack.pop()[1]['end_lineno'] = last
+    return symbols
+
+def source_files(path):
+    """
+    Returns a sorted list of all `.py` files found in a directory (including
+    subdirectories). If `path` is a file, a list containing only `path` is
+    returned.
+    """
+    import os
+    if os.path.isfile(path):
+        return [path]
+    out = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted([d for d in dirs if not d.startswith('.')])
+        out.extend([os.path.join(root, f) for f in sorted(files)
+                    if f.endswith('.py')])
+    return out
+
+def module_name(filename, root=''):
+    """
+    Returns the dotted module name of a file relative to a root directory.
+    The module name of a package `__init__.py` file is the package name.
+    """
+    import os
+    path = os.path.relpath(os.path.splitext(filename)[0], root or '.')
+    parts = [p for p in path.split(os.sep) if p not in ('', '.')]
+    if len(parts) > 1 and parts[-1] == '__init__':
+        parts = parts[:-1]
+    return '.'.join(parts)
+
+def _symbol(cls, function, signature, dtype, label, filename, lineno):
+    return {'class' : cls,
+            'function' : function,
+            'signature' : signature,
+            'docstring' : None,
+            'type' : dtype,
+            'label' : label,
+            'filename' : filename,
+            'lineno' : lineno,
+            'end_lineno' : lineno,
+            'docstring_lineno' : 0}
+
+def _new_symbol(parent, kind, name, signature, filename, lineno):
+    prefix = ''
+    if parent and parent['type'] != 'module':
+        prefix = parent['label'] + '.'
+    label = prefix + name
+    if kind == 'class':
+        return _symbol(label, '', signature, 'class', label, filename, lineno)
+    if parent and parent['type'] == 'class':
+        return _symbol(parent['label'], name, signature, 'method', label,
+                       filename, lineno)
+    return _symbol('', name, signature, 'function', label, filename, lineno)
+
+def _header(lines, i, pos):
+    """
+    Returns the index of the last line of a `def` or `class` header, and the
+    signature (the text within the first pair of parentheses, including
+    them). Headers can span multiple lines.
+    """
+    depth = 0
+    signature = []
+    done = False
+    num_lines = len(lines)
+    while i < num_lines:
+        for char in lines[i][pos:]:
+            if char == '#' and depth == 0:
+                break
+            if char == ':' and depth == 0:
+                return i, ''.join(signature)
+            if char in '([{':
+                depth += 1
+            elif char in ')]}':
+                depth -= 1
+            if not done and (depth > 0 or char == ')'):
+                signature.append(char)
+                done = depth == 0
+        if depth > 0 and not done:
+            signature.append('\n')
+        i += 1
+        pos = 0
+    return num_lines - 1, ''.join(signature)
+
+def _first_statement(lines, i):
+    """
+    Returns the index of the first non-empty line starting at `i`, or `-1`.
+    """
+    num_lines = len(lines)
+    while i < num_lines:
+        stripped = lines[i].strip()
+        if stripped and not stripped.startswith('#'):
+            return i
+        i += 1
+    return -1
+
+def _set_docstring(symbol, lines, i):
+    """
+    Stores the docstring that starts at line `i` (if any) in `symbol`. The
+    docstring is dedented in the same way as by `Extract.find`.
+    """
+    from .extract import remove_indent
+    if i < 0:
+        return
+    match = _DOCSTRING.match(lines[i])
+    if not match:
+        return
+    quote = match.group(2)
+    indent = len(match.group(1))
+    first = lines[i][match.end():]
+    end = first.find(quote)
+    if end >= 0:
+        raw = first[:end]
+    else:
+        body = [first]
+        j = i + 1
+        while j < len(lines):
+            end = lines[j].find(quote)
+            if end >= 0:
+                body.append(lines[j][:end])
+                break
+            body.append(lines[j])
+            j += 1
+        raw = '\n'.join(body)
+    symbol['docstring'] = remove_indent(raw, indent)
+    symbol['docstring_lineno'] = i + 1
+
+def _update_quote(line, quote):
+    """
+    Tracks whether the end of `line` is inside a triple-quoted string.
+
+    Args:
+        line : The line to process.
+        quote : The delimiter of the string that is open at the start of the
+            line, or `None`.
+
+    Returns:
+        The delimiter of the string that is open at the end of the line, or
+        `None`.
+
+    """
+    pos = 0
+    while True:
+        if quote:
+            end = line.find(quote, pos)
+            if end < 0:
+                return quote
+            pos = end + 3
+            quote = None
+        else:
+            match = _QUOTES.search(line, pos)
+            if not match or '#' in line[pos:match.start()]:
+                return None
+            quote = match.group(0)
+            pos = match.end()
+
+def _indent(line):
+    return len(line) - len(line.lstrip())
+
+def _last_line(lines, num_lines):
+    while num_lines > 0 and not lines[num_lines - 1].strip():
+        num_lines -= 1
+    return max(num_lines, 1)
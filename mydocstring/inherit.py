@@ -0,0 +1,212 @@
+"""
+This module resolves the docstrings of methods that are overridden without a
+docstring of their own. The docstring is taken from the first base class (in
+method resolution order) that defines the method with a docstring. Base
+classes are looked up in the same file first, and then in the package that
+contains the file (see `SymbolTable`).
+
+The method resolution order of each class is computed once and memoized, so
+resolving many methods of the same class hierarchy only walks it once.
+"""
+import threading
+
+_RESOLVERS = {}
+# `resolver` is called from several threads (e.g., by `aio`).
+_LOCK = threading.Lock()
+
+class Resolver(object):
+    """
+    Resolves inherited docstrings.
+
+    Attributes:
+        table : A `SymbolTable` that is used to find base classes that are
+            defined in other files, or `None` to only search the same file.
+
+    """
+
+    def __init__(self, table=None):
+        self.table = table
+        self._mro = {}
+        # Resolvers are shared between threads, and an order that is being
+        # computed must not be seen by another thread.
+        self._lock = threading.RLock()
+
+    def resolve(self, fileindex, classname, method):
+        """
+        Finds the first class in the method resolution order of a class that
+        defines a method with a docstring.
+
+        Args:
+            fileindex : The `FileIndex` of the file that defines the class.
+            classname : The label of the class.
+            method : The name of the method.
+
+        Returns:
+            tuple: A tuple containing the `FileIndex` and the dictionary of the
+                method that holds the docstring.
+
+        Raises:
+            NameError: This exception is raised if no docstring is found.
+
+        """
+        for index, cls in self.mro(fileindex, classname):
+            symbol = index.names.get(cls['label'] + '.' + method)
+            if symbol and symbol['docstring'] is not None:
+                return index, symbol
+        raise NameError(r'Unable to find inherited docstring for `%s.%s`' %
+                        (classname, method))
+
+    def mro(self, fileindex, classname):
+        """
+        Returns the method resolution order of a class as a list of tuples
+        containing the `FileIndex` and the dictionary of each class, starting
+        with the class itself. The order is the C3 linearization that Python
+        uses. If the bases have no consistent order (Python raises `TypeError`
+        for such a class), the first remaining candidate is taken instead.
+        Base classes that cannot be found are skipped.
+        """
+        with self._lock:
+            return self._compute_mro(fileindex, classname)
+
+    def _compute_mro(self, fileindex, classname):
+        # Indexes are rebuilt when a file changes, so the order is memoized
+        # per index rather than per filename.
+        key = (fileindex, classname)
+        if key in self._mro:
+            return self._mro[key]
+        # Guard against cyclic definitions while the order is computed.
+        self._mro[key] = []
+
+        out = []
+        cls = fileindex.names.get(classname)
+        if cls and cls['type'] == 'class':
+            orders = []
+            for base in bases(cls['signature']):
+                found = self.find_class(fileindex, base)
+                if found:
+                    order = self.mro(*found)
+                    if order:
+                        orders.append(list(order))
+            orders.append([order[0] for order in orders])
+            out = [(fileindex, cls)] + _merge(orders)
+        self._mro[key] = out
+        return out
+
+    def find_class(self, fileindex, name):
+        """
+        Finds the definition of a base class.
+
+        Args:
+            fileindex : The `FileIndex` of the file that refers to the class.
+            name : The name of the class as written in the class definition,
+                e.g., `Base` or `module.Base`.
+
+        Returns:
+            tuple: A tuple containing the `FileIndex` of the file that defines
+                the class and the label of the class, or `None` if not found.
+
+        """
+        symbol = fileindex.names.get(name)
+        if symbol and symbol['type'] == 'class':
+            return fileindex, name
+        if self.table:
+            entry = self.table.lookup(name)
+            if entry and entry[1]['type'] == 'class':
+                return self.table.files[entry[0]], entry[1]['label']
+        return None
+
+def _merge(orders):
+    """
+    Merges the method resolution orders of the bases of a class, followed by
+    the list of the bases themselves (the merge step of C3).
+    """
+    out = []
+    orders = [order for order in orders if order]
+    while orders:
+        for order in orders:
+            head = order[0]
+            if not any([_contains(other[1:], head) for other in orders]):
+                break
+        else:
+            head = orders[0][0]
+        out.append(head)
+        orders = [[item for item in order if item[1] is not head[1]]
+                  for order in orders]
+        orders = [order for order in orders if order]
+    return out
+
+def _contains(order, cls):
+    return any([item[1] is cls[1] for item in order])
+
+def bases(signature):
+    """
+    Returns the names of the base classes in the signature of a class, e.g.,
+    `'(Base, mixins.Mixin, metaclass=Meta)'` gives `['Base', 'mixins.Mixin']`.
+    """
+    from .check import split_arguments
+    names = []
+    for base in split_arguments(signature.strip()[1:-1]):
+        base = base.strip()
+        if base and '=' not in base and base != 'object':
+            names.append(base.split('[', 1)[0].strip())
+    return names
+
+def package_root(filename):
+    """
+    Returns the top-level package directory that contains a file, or `None`
+    if the file is not part of a package. Virtual filenames such as
+    `<string>` are not part of any package.
+    """
+    import os
+    if filename.startswith('<'):
+        return None
+    directory = os.path.dirname(os.path.abspath(filename))
+    root = None
+    while os.path.isfile(os.path.join(directory, '__init__.py')):
+        root = directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return root
+
+def resolver(filename):
+    """
+    Returns the `Resolver` for the package that contains a file. Resolvers
+    are cached, so the symbol table of each package is built once, and built
+    again when the modification time or size of any file in the package
+    changes. Files that are not part of a package get a new resolver that only
+    searches the file.
+    """
+    from .index import SymbolTable
+    root = package_root(filename)
+    if root is None:
+        return Resolver()
+    stamp = _stamp(root)
+    with _LOCK:
+        entry = _RESOLVERS.get(root)
+    if entry is None or entry[0] != stamp:
+        entry = (stamp, Resolver(SymbolTable.from_package(root)))
+        with _LOCK:
+            _RESOLVERS[root] = entry
+    return entry[1]
+
+def _stamp(root):
+    """
+    Returns the filename, modification time, and size of each file in a
+    package.
+    """
+    import os
+    from .index import source_files
+    stamp = []
+    for filename in source_files(root):
+        stat = os.stat(filename)
+        stamp.append((filename, stat.st_mtime, stat.st_size))
+    return tuple(stamp)
+
+def clear_cache():
+    """
+    Removes all cached resolvers.
+    """
+    with _LOCK:
+        _RESOLVERS.clear()
@@ -0,0 +1,202 @@
+"""
+This module reads the code cells of Jupyter notebooks (`.ipynb`). Notebooks
+can be very large because outputs such as images are embedded in them, so the
+file is read incrementally in chunks: only the `cell_type` and `source` of each
+cell are decoded, and all other values (outputs, attachments, metadata) are
+skipped without being decoded or kept in memory. Memory use is proportional to
+the size of the code, not the size of the notebook.
+"""
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+
+_SPECIAL = re.compile(r'[\\"\[\]{}]')
+_WHITESPACE = ' \t\n\r'
+
+class Reader(object):
+    """
+    Incremental reader of JSON data that is consumed one token at a time.
+
+    Attributes:
+        fh : A file object opened in text mode.
+        chunk_size : The number of characters to read at a time.
+
+    """
+
+    def __init__(self, fh, chunk_size=CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def fill(self):
+        """
+        Reads the next chunk and discards the data that has been consumed.
+        Returns `False` at the end of the file.
+        """
+        if self.eof:
+            return False
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Returns the next character that is not whitespace without consuming
+        it, or `''` at the end of the file.
+        """
+        while True:
+            while self.pos < len(self.buf) and \
+                  self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self.fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, chars):
+        """
+        Consumes the next character that is not whitespace, which must be one
+        of `chars`, and returns it.
+
+        Raises:
+            ValueError: This exception is raised if another character is
+                found.
+
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError('Invalid notebook: expected one of `%s`, found '
+                             '`%s`' % (chars, char))
+        self.pos += 1
+        return char
+
+    def value(self):
+        """
+        Decodes and returns the next value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                # The value continues in the next chunk.
+                if not self.fill():
+                    raise ValueError('Invalid notebook: unexpected end of '
+                                     'file')
+                continue
+            # A number could continue in the next chunk.
+            if end < len(self.buf) or self.eof or isinstance(value, str):
+                self.pos = end
+                return value
+            if not self.fill():
+                self.pos = end
+                return value
+
+    def skip(self):
+        """
+        Skips the next value without decoding it.
+        """
+        char = self.peek()
+        if char not in '"[{':
+            self.value()
+            return
+        depth = 0
+        in_string = False
+        while True:
+            match = _SPECIAL.search(self.buf, self.pos)
+            if not match:
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError('Invalid notebook: unexpected end of '
+                                     'file')
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if char == '\\':
+                # Skip the escaped character, which may be in the next chunk.
+                if self.pos == len(self.buf) and not self.fill():
+                    raise ValueError('Invalid notebook: unexpected end of '
+                                     'file')
+                self.pos += 1
+            elif char == '"':
+                in_string = not in_string
+                if not in_string and depth == 0:
+                    return
+            elif not in_string:
+                depth += 1 if char in '[{' else -1
+                if depth == 0:
+                    return
+
+    def items(self):
+        """
+        Iterates over the keys of the next object. The value of each key must
+        be consumed (using `value`, `skip`, or `items`) before the next key is
+        read.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+    def elements(self):
+        """
+        Iterates over the elements of the next array. Each element must be
+        consumed before the next element is read.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.expect(',]') == ']':
+                return
+
+def code_cells(fh, chunk_size=CHUNK_SIZE):
+    """
+    Iterates over the code cells of a notebook.
+
+    Args:
+        fh : A file object, opened in text mode, that contains the notebook.
+        chunk_size : The number of characters to read at a time.
+
+    Yields:
+        tuple: A tuple containing the position of the cell in the notebook
+            (0-based, counting all cells) and the source code of the cell.
+
+    Raises:
+        ValueError: This exception is raised if the notebook is not valid
+            JSON data.
+
+    """
+    reader = Reader(fh, chunk_size)
+    for key in reader.items():
+        if key != 'cells':
+            reader.skip()
+            continue
+        for i, _ in enumerate(reader.elements()):
+            cell_type = None
+            source = ''
+            for field in reader.items():
+                if field == 'cell_type':
+                    cell_type = reader.value()
+                elif field == 'source':
+                    source = reader.value()
+                else:
+                    reader.skip()
+            if cell_type == 'code':
+                if isinstance(source, list):
+                    source = ''.join(source)
+                yield i, source
@@ -28,6 +28,7 @@ module. After parsing, the data of docstring is stored in a dictionary. This
 data can for instance be serialized using JSON, or rendered to markdown.
 """
 import re
+from . import profile
 
 class DocString(object):
     """
@@ -40,12 +41,15 @@ class DocString(object):
             after the section name (e.g., `Arguments:`). Defaults to `': '`.
         indent : An int that specifies the minimum number of spaces to use for
             indentation.
+        filename : A string that specifies the file the docstring was
+            extracted from. Only used for reporting.
 
     """
 
-    def __init__(self, docstring, config=None):
+    def __init__(self, docstring, config=None, filename=''):
         self.header = {}
         self.docstring = docstring
+        self.filename = filename
         self.data = []
         self._config = config
 
@@ -66,10 +70,11 @@ class DocString(object):
         This method should be overloaded and perform the parsing of all
         sections.
         """
-        self.data = []
-        self.extract_sections()
-        for section in self._parsing['sections']:
-            self.data.append(self.parse_section(section))
+        with profile.phase('parse', self.filename):
+            self.data = []
+            self.extract_sections()
+            for section in self._parsing['sections']:
+                self.data.append(self.parse_section(section))
         return self.data
 
     def extract_sections(self):
@@ -120,7 +125,7 @@ class GoogleDocString(DocString):
     to the Google style guide: .
     """
 
-    def __init__(self, docstring, config=None):
+    def __init__(self, docstring, config=None, filename=''):
         import os
 
         if not config:
@@ -131,7 +136,7 @@ class GoogleDocString(DocString):
             config['delimiter'] = ':'
             config['arg_delimiter'] = ': '
 
-        super(GoogleDocString, self).__init__(docstring, config)
+        super(GoogleDocString, self).__init__(docstring, config, filename)
 
         self._re = {'header' : self._compile_header(),
                     'indent' : self._compile_indent(),
@@ -320,7 +325,7 @@ def _get_next_line(lines, linenumber):
             return lines[inc]
         inc += 1
 
-def parser(obj, choice='Google'):
+def parser(obj, choice='Google', filename=''):
     """
     Returns a new docstring parser based on selection. Currently, only the
     Google docstring syntax is supported.
@@ -330,6 +335,8 @@ def parser(obj, choice='Google'):
             This object is typically obtained by calling the `extract` function.
         choice: Keyword that determines the parser to use. Defaults to
             `'Google'`.
+        filename: The file that the docstring was extracted from. Only used
+            for reporting.
 
     Returns:
         A parser for the selected docstring syntax.
@@ -341,7 +348,7 @@ def parser(obj, choice='Google'):
     parsers = {'Google' : GoogleDocString}
 
     if choice in parsers:
-        return parsers[choice](obj)
+        return parsers[choice](obj, filename=filename)
     else:
         NotImplementedError('The docstring parser `%s` is not implemented' %
                             choice)
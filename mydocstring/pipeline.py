@@ -0,0 +1,431 @@
+"""
+This module outputs the docstrings of all symbols in a code base using a
+pipeline of overlapping stages:
+    * `read` : Threads read the source files.
+    * `process` : Worker processes extract and parse the docstrings of each
+      file.
+    * `write` : The calling thread renders the docstrings and writes them to
+      an output directory (one file per source file) or to `stdout`.
+
+The stages are connected by bounded queues, and the number of files that are
+being processed at once is bounded by the size of the queues. Hence, peak
+memory use depends on the queue sizes and the largest files, not on the size
+of the code base. Files are written in the order they are read, which can
+differ from the order they are found if there are several readers.
+
+Statistics are collected for each stage and queue to help choosing the
+number of workers (see `Pipeline.stats`).
+"""
+import time
+
+FORMATS = {'text' : '.txt', 'markdown' : '.md', 'json' : '.json'}
+
+_DONE = None
+
+class Pipeline(object):
+    """
+    Runs the pipeline.
+
+    Attributes:
+        paths : A list of strings that specify files or directories.
+        output : A string that specifies the output directory, or `None` to
+            write to `stdout`.
+        fmt : The output format: `'text'`, `'markdown'`, or `'json'`.
+        template : The Mako template to use for Markdown output.
+        readers : The number of threads that read files.
+        jobs : The number of worker processes. Defaults to the number of
+            processors. Set to `1` to process the files in a thread of this
+            process.
+        queue_size : The maximum number of files held by each queue.
+        stats : A dictionary with the statistics of the last run (see
+            `Pipeline.run`).
+
+    """
+
+    def __init__(self, paths, output=None, fmt='text', template=None,
+                 readers=4, jobs=None, queue_size=16):
+        import os
+        if fmt not in FORMATS:
+            raise ValueError('Unknown output format: `%s`' % fmt)
+        self.paths = paths
+        self.output = output
+        self.fmt = fmt
+        self.template = template
+        self.readers = readers
+        self.jobs = jobs or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.stats = {}
+
+    def run(self):
+        """
+        Runs the pipeline and waits until all files have been written.
+
+        Returns:
+            dict: The statistics of the run, with the following keys:
+                * `time` : Wall time in seconds.
+                * `files`, `symbols` : The number of files and docstrings
+                    written.
+                * `skipped` : The symbols whose docstring cannot be parsed,
+                    and hence are not written (see `process_file`).
+                * `stages` : A dictionary with the statistics of each stage
+                    (`read`, `process`, `write`). Each stage holds the keys
+                    `workers`, `items` (files), `busy` (seconds spent
+                    working, summed over the workers), `throughput` (files
+                    per second), and `utilization` (the fraction of the wall
+                    time that the workers were busy).
+                * `queues` : A dictionary with the statistics of the queues
+                    that feed each stage (`read`, `process`, `write`). Each
+                    queue holds the keys `size` (the bound), `max_depth`, and
+                    `mean_depth` (measured each time an item is taken).
+                A stage with a high utilization whose queue is often full is
+                a bottleneck, and benefits from more workers.
+
+        Raises:
+            ValueError: This exception is raised before any file is read if
+                two files would be written to the same output file.
+            Exception: The first exception raised by any stage is raised
+                again once the pipeline has stopped.
+
+        """
+        import queue
+        import threading
+        files = self._files()
+        self._stop = threading.Event()
+        self._errors = []
+        self._queues = dict([(name, queue.Queue(self.queue_size))
+                             for name in ['read', 'process', 'write']])
+        self._depths = dict([(name, []) for name in self._queues])
+        self._stages = {'read' : _stage(self.readers),
+                        'process' : _stage(self.jobs),
+                        'write' : _stage(1)}
+        self._symbols = 0
+        self._skipped = []
+        self._lock = threading.Lock()
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._guard,
+                                    args=(self._feed, files))]
+        threads += [threading.Thread(target=self._guard, args=(self._read,))
+                    for _ in range(self.readers)]
+        threads += [threading.Thread(target=self._guard,
+                                     args=(self._process,))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        self._guard(self._write)
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        self.stats = self._report(elapsed)
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
+
+    def _guard(self, func, *args):
+        """
+        Runs a stage, and stops the pipeline if it fails.
+        """
+        try:
+            func(*args)
+        except _Stopped:
+            pass
+        except BaseException as err:
+            self._errors.append(err)
+            self._stop.set()
+
+    def _put(self, name, item):
+        """
+        Puts an item in a queue, waiting until there is room unless the
+        pipeline is stopped.
+        """
+        import queue
+        while not self._stop.is_set():
+            try:
+                self._queues[name].put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise _Stopped()
+
+    def _get(self, name):
+        """
+        Takes an item from a queue, waiting until one is available unless the
+        pipeline is stopped.
+        """
+        import queue
+        depth = self._queues[name].qsize()
+        while not self._stop.is_set():
+            try:
+                item = self._queues[name].get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self._depths[name].append(depth)
+            return item
+        raise _Stopped()
+
+    def _files(self):
+        """
+        Returns a list of tuples containing each file to process and the name
+        of its output, i.e., the path relative to the directory given in
+        `paths`, or the base name of a file. If several directories are given,
+        the name starts with the name of the directory.
+
+        Raises:
+            ValueError: This exception is raised if two files would be written
+                to the same output file.
+
+        """
+        import os
+        from .index import source_files
+        files = []
+        names = {}
+        for path in self.paths:
+            for filename in source_files(path):
+                if os.path.isdir(path):
+                    name = os.path.relpath(filename, path)
+                    if len(self.paths) > 1:
+                        name = os.path.join(
+                            os.path.basename(os.path.abspath(path)), name)
+                else:
+                    name = os.path.basename(filename)
+                key = os.path.splitext(name)[0]
+                if self.output and key in names:
+                    raise ValueError('`%s` and `%s` would be written to the '
+                                     'same file' % (names[key], filename))
+                names[key] = filename
+                files.append((filename, name))
+        return files
+
+    def _feed(self, files):
+        for item in files:
+            self._put('read', item)
+        for _ in range(self.readers):
+            self._put('read', _DONE)
+
+    def _read(self):
+        while True:
+            item = self._get('read')
+            if item is _DONE:
+                self._put('process', _DONE)
+                return
+            start = time.perf_counter()
+            with open(item[0], 'rb') as fh:
+                data = fh.read()
+            self._record('read', time.perf_counter() - start)
+            self._put('process', item + (data,))
+
+    def _process(self):
+        """
+        Submits files to the worker processes. The results are passed on in
+        the order the files were submitted, and at most `queue_size` files are
+        processed at once.
+        """
+        import collections
+        markdown = self.fmt == 'markdown'
+        pending = collections.deque()
+        done = 0
+        executor = None
+        if self.jobs > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Forking while the reader threads hold locks can deadlock the
+            # workers, so they are started from a fresh interpreter.
+            executor = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                mp_context=multiprocessing.get_context('spawn'))
+        try:
+            while done < self.readers:
+                item = self._get('process')
+                if item is _DONE:
+                    done += 1
+                    continue
+                filename, name, data = item
+                if executor:
+                    pending.append((name, executor.submit(
+                        process_file, filename, data, markdown)))
+                else:
+                    pending.append((name, process_file(filename, data,
+                                                       markdown)))
+                while len(pending) >= max(1, self.queue_size):
+                    self._forward(*pending.popleft())
+            while pending:
+                self._forward(*pending.popleft())
+        finally:
+            if executor:
+                for _, future in pending:
+                    future.cancel()
+                executor.shutdown()
+        self._put('write', _DONE)
+
+    def _forward(self, name, result):
+        import concurrent.futures
+        if not isinstance(result, tuple):
+            while not self._stop.is_set():
+                try:
+                    result = result.result(timeout=0.1)
+                    break
+                except concurrent.futures.TimeoutError:
+                    pass
+            else:
+                raise _Stopped()
+        items, skipped, elapsed = result
+        self._record('process', elapsed)
+        with self._lock:
+            self._skipped.extend(skipped)
+        self._put('write', (name, items))
+
+    def _write(self):
+        import os
+        import sys
+        template = None
+        headers = None
+        if self.fmt == 'markdown':
+            from . import command
+            from . import parse
+            template = command.load_template(self.template or
+                                             command.TEMPLATE)
+            headers = parse.parser('').markdown()[0]
+        while True:
+            item = self._get('write')
+            if item is _DONE:
+                return
+            start = time.perf_counter()
+            name, items = item
+            txt = render(items, self.fmt, template, headers)
+            if self.output:
+                filename = os.path.join(self.output, os.path.splitext(name)[0]
+                                        + FORMATS[self.fmt])
+                directory = os.path.dirname(filename)
+                if not os.path.isdir(directory):
+                    os.makedirs(directory)
+                with open(filename, 'w') as fh:
+                    fh.write(txt + '\n')
+            else:
+                sys.stdout.write(txt + '\n')
+            with self._lock:
+                self._symbols += len(items)
+            self._record('write', time.perf_counter() - start)
+
+    def _record(self, name, elapsed):
+        with self._lock:
+            stage = self._stages[name]
+            stage['items'] += 1
+            stage['busy'] += elapsed
+
+    def _report(self, elapsed):
+        stages = {}
+        for name, stage in self._stages.items():
+            stage = dict(stage)
+            stage['throughput'] = stage['items'] / elapsed if elapsed else 0.0
+            stage['utilization'] = (stage['busy'] /
+                                    (elapsed * stage['workers'])
+                                    if elapsed else 0.0)
+            stages[name] = stage
+        queues = {}
+        for name, depths in self._depths.items():
+            queues[name] = {'size' : self.queue_size,
+                            'max_depth' : max(depths) if depths else 0,
+                            'mean_depth' : (float(sum(depths)) / len(depths)
+                                            if depths else 0.0)}
+        return {'time' : elapsed, 'files' : stages['write']['items'],
+                'symbols' : self._symbols, 'skipped' : self._skipped,
+                'stages' : stages,
+                'queues' : queues}
+
+class _Stopped(Exception):
+    """
+    Raised in a stage when another stage has failed.
+    """
+    pass
+
+def _stage(workers):
+    return {'workers' : workers, 'items' : 0, 'busy' : 0.0}
+
+def process_file(filename, data, source=False):
+    """
+    Extracts and parses the docstrings of all symbols in a file. The symbols
+    are taken from the index of the file (see `index.scan`), so nested
+    definitions and classes with any bases are included.
+
+    Args:
+        filename : A string that specifies the file.
+        data : Bytes that contain the contents of the file.
+        source : Set to `True` to include the source code of functions and
+            methods in the results.
+
+    Returns:
+        tuple: A tuple containing a list of dictionaries with the keys
+            `docstring` (see `extract.extract`) and `sections` (the parsed
+            sections), a list of the symbols whose docstring cannot be parsed
+            (dictionaries with the keys `filename`, `lineno`, `label`, and
+            `message`), and the time spent in seconds.
+
+    """
+    from . import extract
+    from . import index
+    from . import parse
+    start = time.perf_counter()
+    extractor = extract.extractor(filename, data.decode('utf-8', 'replace'))
+    # The index is not cached (see `index.get`), so that memory use does not
+    # grow with the number of files.
+    fileindex = index.FileIndex.from_source(extractor.txt, filename)
+    items = []
+    skipped = []
+    for symbol in fileindex.symbols:
+        if symbol['docstring'] is None:
+            continue
+        docstring = extractor.extract_symbol(symbol)
+        try:
+            parser = parse.parser(docstring['docstring'], 'Google', filename)
+            parser.parse()
+        except (SyntaxError, ValueError) as err:
+            skipped.append({'filename' : filename,
+                            'lineno' : symbol['lineno'],
+                            'label' : symbol['label'] or '.',
+                            'message' : str(err)})
+            continue
+        if source:
+            docstring = docstring.materialize()
+        else:
+            docstring = dict([(key, docstring[key]) for key in docstring
+                              if key != 'source'])
+        items.append({'docstring' : docstring, 'sections' : parser.data})
+    return items, skipped, time.perf_counter() - start
+
+def render(items, fmt, template=None, headers=None):
+    """
+    Renders the docstrings of a file.
+
+    Args:
+        items : The docstrings returned by `process_file`.
+        fmt : The output format: `'text'`, `'markdown'`, or `'json'`.
+        template : The template to use for Markdown output (see
+            `command.load_template`).
+        headers : The section headers for Markdown output.
+
+    """
+    import json
+    from . import command
+    if fmt == 'json':
+        return json.dumps([dict(item['docstring'], sections=item['sections'])
+                           for item in items], sort_keys=True, indent=4,
+                          separators=(',', ': '))
+    if fmt == 'markdown':
+        return '\n'.join([command.format_markdown(template, item['docstring'],
+                                                  headers, item['sections'])
+                          for item in items])
+    return '\n\n'.join([command.format_text(item['docstring'])
+                        for item in items])
+
+def run(paths, output=None, fmt='text', template=None, readers=4, jobs=None,
+        queue_size=16):
+    """
+    Runs the pipeline (see `Pipeline`).
+
+    Returns:
+        dict: The statistics of the run (see `Pipeline.run`).
+
+    """
+    return Pipeline(paths, output, fmt, template, readers, jobs,
+                    queue_size).run()
@@ -0,0 +1,241 @@
+"""
+This module records how much time (and optionally memory) is spent in each
+phase of a run. The phases are reading the source (`read`), searching for the
+docstring (`extract`), parsing the docstring (`parse`), and producing the
+output (`render`). Statistics are kept both per phase and per file, and are
+reported as a dictionary that can be serialized to JSON or forwarded to a
+user-supplied callback.
+
+Example:
+    ```
+    from mydocstring import profile
+    profiler = profile.enable(memory=True)
+    ...
+    profile.disable()
+    print(profiler.__json__())
+    ```
+
+"""
+import time
+
+_ACTIVE = None
+
+class Profiler(object):
+    """
+    Collects wall time, call counts, and peak memory usage for each phase.
+
+    Attributes:
+        memory : A bool that enables tracking of peak memory usage using
+            `tracemalloc`. Defaults to `False`.
+        callback : A function that is called with the report (see
+            `Profiler.report`) when `Profiler.emit` is called.
+        phases : A dictionary that holds the statistics for each phase.
+        files : A dictionary that holds the statistics for each phase,
+            grouped by filename.
+
+    """
+
+    def __init__(self, memory=False, callback=None):
+        self.memory = memory
+        self.callback = callback
+        self.phases = {}
+        self.files = {}
+        self._started_tracemalloc = False
+        self._start = None
+        self._elapsed = 0.0
+
+    def start(self):
+        """
+        Starts the profiler. If memory tracking is enabled, `tracemalloc` is
+        started unless it is already running.
+        """
+        if self.memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """
+        Stops the profiler and stops `tracemalloc` if it was started by
+        `Profiler.start`.
+        """
+        if self._start is not None:
+            self._elapsed += time.perf_counter() - self._start
+            self._start = None
+        if self._started_tracemalloc:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def phase(self, name, filename=''):
+        """
+        Returns a context manager that measures the code executed within it.
+
+        Args:
+            name : A string that specifies the name of the phase.
+            filename : A string that specifies the file being processed.
+
+        """
+        return _Phase(self, name, filename)
+
+    def record(self, name, filename, elapsed, peak=None):
+        """
+        Adds a measurement to the statistics.
+
+        Args:
+            name : A string that specifies the name of the phase.
+            filename : A string that specifies the file that was processed.
+            elapsed : Wall time in seconds.
+            peak : Peak memory usage in bytes, or `None` if not measured.
+
+        """
+        _accumulate(self.phases, name, elapsed, peak)
+        if filename:
+            _accumulate(self.files.setdefault(filename, {}), name, elapsed,
+                        peak)
+
+    def report(self):
+        """
+        Returns the collected statistics.
+
+        Returns:
+            dict: A dictionary with the following keys:
+                * `total` : Wall time in seconds since the profiler was
+                    started.
+                * `phases` : Statistics for each phase. Each phase holds the
+                    keys `calls`, `time`, and `peak_memory` (if enabled, and
+                    on Python 3.9 or later). `peak_memory` is the largest
+                    amount of memory in bytes that a call allocated on top of
+                    what was allocated when it started.
+                * `files` : Statistics for each phase grouped by filename.
+
+        """
+        total = self._elapsed
+        if self._start is not None:
+            total += time.perf_counter() - self._start
+        return {'total' : total, 'phases' : self.phases, 'files' : self.files}
+
+    def emit(self):
+        """
+        Passes the report to the callback, or prints it as JSON data to
+        `stderr` if no callback has been set.
+        """
+        if self.callback:
+            self.callback(self.report())
+        else:
+            import sys
+            sys.stderr.write(self.__json__() + '\n')
+
+    def __json__(self):
+        """
+        Output report as JSON data.
+        """
+        import json
+        return json.dumps(self.report(), sort_keys=True,
+                          indent=4, separators=(',', ': '))
+
+class _Phase(object):
+    """
+    Context manager that measures a single phase.
+    """
+
+    def __init__(self, profiler, name, filename):
+        self.profiler = profiler
+        self.name = name
+        self.filename = filename
+        self._start = 0.0
+        self._memory = None
+
+    def __enter__(self):
+        self._memory = None
+        if self.profiler.memory:
+            import tracemalloc
+            # `reset_peak` requires Python 3.9. Without it, the peak of a
+            # phase cannot be told apart from earlier peaks.
+            if tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+                self._memory = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        elapsed = time.perf_counter() - self._start
+        peak = None
+        if self._memory is not None:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1] - self._memory
+        self.profiler.record(self.name, self.filename, elapsed, peak)
+        return False
+
+class _NullPhase(object):
+    """
+    Context manager that does nothing. Used when profiling is disabled.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+def _accumulate(stats, name, elapsed, peak):
+    entry = stats.setdefault(name, {'calls' : 0, 'time' : 0.0})
+    entry['calls'] += 1
+    entry['time'] += elapsed
+    if peak is not None:
+        entry['peak_memory'] = max(entry.get('peak_memory', 0), peak)
+
+def enable(memory=False, callback=None):
+    """
+    Creates a new profiler, starts it, and makes it the active profiler.
+
+    Args:
+        memory : Set to `True` to track peak memory usage.
+        callback : A function that receives the report when the profiler is
+            emitted.
+
+    Returns:
+        The active profiler.
+
+    """
+    global _ACTIVE
+    _ACTIVE = Profiler(memory=memory, callback=callback)
+    _ACTIVE.start()
+    return _ACTIVE
+
+def disable():
+    """
+    Stops the active profiler and returns it. Returns `None` if no profiler is
+    active.
+    """
+    global _ACTIVE
+    profiler = _ACTIVE
+    _ACTIVE = None
+    if profiler:
+        profiler.stop()
+    return profiler
+
+def active():
+    """
+    Returns the active profiler, or `None` if profiling is disabled.
+    """
+    return _ACTIVE
+
+def phase(name, filename=''):
+    """
+    Returns a context manager that measures a phase using the active profiler.
+    Nothing is measured if profiling is disabled.
+
+    Args:
+        name : A string that specifies the name of the phase.
+        filename : A string that specifies the file being processed.
+
+    """
+    if _ACTIVE is None:
+        return _NULL_PHASE
+    return _ACTIVE.phase(name, filename)
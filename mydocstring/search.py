@@ -0,0 +1,280 @@
+"""
+This module provides full-text search over the docstrings of a code base. An
+inverted index is built from the parsed docstring sections (the summary, the
+fields of `Args`, and the exception types of `Raises`) and stored as JSON data
+on disk. The index is updated incrementally: only files that have changed
+since the last update are read again. Searching only reads the index and never
+the sources. However, the whole index is loaded for each search, so the time
+of a single search from the command line grows with the size of the index;
+keep a `SearchIndex` loaded to run many searches.
+
+Large code bases can be indexed in shards: each shard indexes a deterministic
+subset of the files (see `in_shard`), and the partial indexes are combined
+using `SearchIndex.merge` without reading any sources.
+"""
+import re
+
+SECTIONS = {'Args' : 'Args', 'Arguments' : 'Args', 'Raises' : 'Raises'}
+
+_TOKEN = re.compile(r'\w+')
+
+class SearchIndex(object):
+    """
+    Inverted index of docstrings.
+
+    Attributes:
+        files : A dictionary that maps each indexed file to a dictionary with
+            the keys `mtime`, `size`, and `docs`. The key `docs` holds a list
+            of the indexed documents, which are dictionaries with the keys
+            `label`, `type`, `lineno`, `section`, and `text`.
+        postings : A dictionary that maps each token to a dictionary that
+            maps filenames to the positions of the documents in `docs` that
+            contain the token.
+
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.postings = {}
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Loads an index from disk. An empty index is returned if the file does
+        not exist.
+        """
+        import json
+        import os
+        index = cls()
+        if os.path.exists(filename):
+            with open(filename) as fh:
+                data = json.load(fh)
+            index.files = data['files']
+            index.postings = data['postings']
+        return index
+
+    def save(self, filename):
+        """
+        Writes the index to disk.
+        """
+        import json
+        with open(filename, 'w') as fh:
+            json.dump({'files' : self.files, 'postings' : self.postings}, fh,
+                      sort_keys=True, separators=(',', ':'))
+
+    def update(self, paths, shard=None):
+        """
+        Indexes all `.py` files in a list of files or directories. Files that
+        have not changed since they were indexed are skipped, and files that
+        no longer exist are removed from the index.
+
+        Args:
+            paths : A list of strings that specify files or directories.
+            shard : A tuple `(i, n)` that restricts the update to shard `i` of
+                `n` (see `in_shard`). Files of other shards are removed from
+                the index.
+
+        Returns:
+            list: The files that have been (re-)indexed.
+
+        """
+        import os
+        from .index import source_files
+        seen = set()
+        changed = []
+        for path in paths:
+            for filename in source_files(path):
+                if shard and not in_shard(filename, *shard):
+                    continue
+                seen.add(filename)
+                stat = os.stat(filename)
+                entry = self.files.get(filename)
+                if entry and entry['mtime'] == stat.st_mtime and \
+                   entry['size'] == stat.st_size:
+                    continue
+                with open(filename) as fh:
+                    txt = fh.read()
+                self.add(filename, txt, stat.st_mtime, stat.st_size)
+                changed.append(filename)
+        for path in paths:
+            prefix = os.path.join(path, '')
+            for filename in list(self.files):
+                if filename not in seen and (filename == path or
+                                             filename.startswith(prefix)):
+                    self.remove(filename)
+        return changed
+
+    def add(self, filename, txt, mtime=0, size=0):
+        """
+        Indexes source code. Any previous documents of the file are replaced.
+
+        Args:
+            filename : A string that specifies the file.
+            txt : A string that contains the source code of the file.
+            mtime : Modification time of the file.
+            size : Size of the file in bytes.
+
+        """
+        from .index import scan
+        self.remove(filename)
+        docs = []
+        for symbol in scan(txt, filename):
+            docs.extend(documents(symbol))
+        self.files[filename] = {'mtime' : mtime, 'size' : size, 'docs' : docs}
+        for i, doc in enumerate(docs):
+            for token in set(tokenize(doc['text'])):
+                self.postings.setdefault(token, {}).setdefault(filename,
+                                                               []).append(i)
+
+    def remove(self, filename):
+        """
+        Removes all documents of a file from the index.
+        """
+        entry = self.files.pop(filename, None)
+        if not entry:
+            return
+        tokens = set()
+        for doc in entry['docs']:
+            tokens.update(tokenize(doc['text']))
+        for token in tokens:
+            files = self.postings.get(token, {})
+            files.pop(filename, None)
+            if not files:
+                self.postings.pop(token, None)
+
+    def merge(self, other):
+        """
+        Adds all files of another index to this index. If a file is present
+        in both indexes, the version with the latest modification time is
+        kept.
+
+        Args:
+            other : The `SearchIndex` to merge into this index.
+
+        """
+        for filename, entry in other.files.items():
+            current = self.files.get(filename)
+            if current and current['mtime'] > entry['mtime']:
+                continue
+            self.remove(filename)
+            self.files[filename] = entry
+        for token, files in other.postings.items():
+            for filename, positions in files.items():
+                if self.files.get(filename) is other.files[filename]:
+                    self.postings.setdefault(token, {})[filename] = positions
+
+    def search(self, query):
+        """
+        Finds all documents that contain every word of a query (the search is
+        case insensitive).
+
+        Args:
+            query : A string that contains the words to search for.
+
+        Returns:
+            list: A list of dictionaries with the keys `filename`, `label`,
+                `type`, `lineno`, `section`, and `text`, sorted by filename
+                and line number.
+
+        """
+        postings = []
+        for token in set(tokenize(query)):
+            files = self.postings.get(token)
+            if not files:
+                return []
+            postings.append(files)
+        if not postings:
+            return []
+        # Only the documents of the rarest token (the one found in the fewest
+        # files) are candidates, and the postings of the other tokens are only
+        # looked up for the files that contain a candidate.
+        postings.sort(key=len)
+        hits = []
+        for filename, positions in postings[0].items():
+            others = [files.get(filename) for files in postings[1:]]
+            if not all(others):
+                continue
+            others = [set(other) for other in others]
+            hits.extend([(filename, i) for i in positions
+                         if all([i in other for other in others])])
+        out = []
+        for filename, i in hits:
+            doc = dict(self.files[filename]['docs'][i])
+            doc['filename'] = filename
+            out.append(doc)
+        return sorted(out, key=lambda d: (d['filename'], d['lineno'],
+                                          d['section']))
+
+def in_shard(filename, i, n):
+    """
+    Returns `True` if a file belongs to shard `i` of `n` (`1 <= i <= n`). Files
+    are assigned to shards by a hash of their path, so the partition is the
+    same on every machine as long as the paths are given the same way (e.g.,
+    relative to the root of the repository).
+    """
+    import zlib
+    path = filename.replace('\\', '/').encode('utf-8')
+    return zlib.crc32(path) % n == i - 1
+
+def parse_shard(shard):
+    """
+    Parses a shard specification such as `'2/4'` into the tuple `(2, 4)`.
+
+    Raises:
+        ValueError: This exception is raised if the specification is invalid.
+
+    """
+    try:
+        i, n = [int(value) for value in shard.split('/')]
+    except ValueError:
+        raise ValueError('Invalid shard: `%s` (expected `i/n`)' % shard)
+    if not 1 <= i <= n:
+        raise ValueError('Invalid shard: `%s` (expected 1 <= i <= n)' % shard)
+    return i, n
+
+def documents(symbol):
+    """
+    Returns the documents to index for a symbol: one for the summary, one for
+    the `Args` section, and one for the `Raises` section (if present).
+
+    Args:
+        symbol : A dictionary that describes a symbol (see `index.scan`).
+
+    """
+    from . import parse
+    if not symbol['docstring']:
+        return []
+
+    def doc(section, text):
+        return {'label' : symbol['label'], 'type' : symbol['type'],
+                'lineno' : symbol['lineno'], 'section' : section,
+                'text' : text}
+
+    try:
+        sections = parse.parser(symbol['docstring'],
+                                filename=symbol['filename']).parse()
+    except (SyntaxError, ValueError):
+        return [doc('Summary', symbol['docstring'].strip())]
+
+    out = []
+    for section in sections:
+        if not section['header']:
+            if section['text'].strip() and not out:
+                out.append(doc('Summary', section['text'].strip()))
+        elif section['header'] in SECTIONS:
+            name = SECTIONS[section['header']]
+            if name == 'Raises':
+                text = ' '.join([arg['field'] for arg in section['args']])
+            else:
+                text = '\n'.join(['%s: %s' % (arg['field'],
+                                              arg['description'].strip())
+                                  for arg in section['args']])
+            if text:
+                out.append(doc(name, text))
+    return out
+
+def tokenize(txt):
+    """
+    Splits a string into lower case words.
+    """
+    return _TOKEN.findall(txt.lower())
@@ -0,0 +1,125 @@
+"""
+This module reports the startup cost of the command line interface, i.e., how
+long it takes to start the interpreter and import each module before any work
+is done. The command is run again in a new interpreter with `-X importtime`
+(Python 3.7+), and the import times that it reports are summarized per
+module.
+"""
+
+_LINE = 'import time:'
+
+def measure(args):
+    """
+    Runs the command line interface in a new interpreter and measures the
+    import time of each module.
+
+    Args:
+        args : A list of strings that contains the command line arguments.
+
+    Returns:
+        dict: A dictionary with the following keys:
+            * `total` : Wall time in seconds of the whole run, including
+                starting the interpreter.
+            * `imports` : The import time of each module (see `parse`).
+            * `stdout`, `stderr` : The output of the command (without the
+                import times).
+            * `returncode` : The exit status of the command.
+
+    """
+    import os
+    import subprocess
+    import sys
+    import time
+    code = ('import sys\n'
+            'from mydocstring.docstring import main\n'
+            'sys.argv[1:] = %r\n'
+            'main()\n' % list(args))
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root] + [path for path in
+                                                  [env.get('PYTHONPATH')]
+                                                  if path])
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', code],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            env=env, universal_newlines=True)
+    stdout, stderr = proc.communicate()
+    total = time.perf_counter() - start
+    lines = stderr.splitlines(True)
+    return {'total' : total,
+            'imports' : parse(stderr),
+            'stdout' : stdout,
+            'stderr' : ''.join([line for line in lines
+                                if not line.startswith(_LINE)]),
+            'returncode' : proc.returncode}
+
+def parse(txt):
+    """
+    Parses the output of `python -X importtime`.
+
+    Args:
+        txt : A string that contains the output.
+
+    Returns:
+        list: A list of dictionaries with the keys `module`, `self`, and
+            `cumulative` (import times in seconds), and `depth` (0 for
+            modules imported by the command itself, 1 for modules imported by
+            those modules, etc.), in the order the imports completed.
+
+    """
+    out = []
+    for line in txt.splitlines():
+        if not line.startswith(_LINE):
+            continue
+        fields = line[len(_LINE):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Skip the header of the table.
+            continue
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        out.append({'module' : module,
+                    'self' : int(fields[0]) * 1e-6,
+                    'cumulative' : int(fields[1]) * 1e-6,
+                    'depth' : (len(name) - len(module) - 1) // 2})
+    return out
+
+def format_text(result, limit=20):
+    """
+    Formats the result of `measure` as a table of the modules with the
+    largest import times.
+
+    Args:
+        result : A dictionary returned by `measure`.
+        limit : The maximum number of modules to list.
+
+    """
+    imports = sorted(result['imports'], key=lambda item: -item['self'])
+    top = sum([item['cumulative'] for item in result['imports']
+               if item['depth'] == 0])
+    lines = ['startup: %.1f ms total, %.1f ms importing %d modules' %
+             (result['total'] * 1e3, top * 1e3, len(imports)),
+             '%10s %12s  %s' % ('self [ms]', 'cumul. [ms]', 'module')]
+    for item in imports[:limit]:
+        lines.append('%10.2f %12.2f  %s' % (item['self'] * 1e3,
+                                            item['cumulative'] * 1e3,
+                                            item['module']))
+    return '\n'.join(lines)
+
+def report(args, limit=20):
+    """
+    Runs the command line interface, forwards its output, and writes the
+    startup report to `stderr`. Exits with the status of the command.
+
+    Args:
+        args : A list of strings that contains the command line arguments
+            (without `--startup-report`).
+        limit : The maximum number of modules to list.
+
+    """
+    import sys
+    result = measure(args)
+    sys.stdout.write(result['stdout'])
+    sys.stderr.write(result['stderr'])
+    sys.stderr.write(format_text(result, limit) + '\n')
+    if result['returncode']:
+        sys.exit(result['returncode'])
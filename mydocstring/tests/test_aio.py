@@ -0,0 +1,57 @@
+import asyncio
+import concurrent.futures
+import pytest
+from .. import aio
+from .. import extract
+
+FILENAME = 'fixtures/example.py'
+
+def test_aextract_many(monkeypatch):
+    queries = [(FILENAME, 'function_with_docstring'),
+               (FILENAME, 'ExampleOldClass'),
+               (FILENAME, 'ExampleOldClass.class_function_with_docstring'),
+               (FILENAME, 'missing')]
+    expected = [extract.extract(filename, query)
+                for filename, query in queries[:3]]
+
+    reads = []
+    extractor = extract.extractor
+
+    def counting(filename, *args, **kwargs):
+        reads.append(filename)
+        return extractor(filename, *args, **kwargs)
+    monkeypatch.setattr(extract, 'extractor', counting)
+
+    results = asyncio.run(aio.aextract_many(queries, return_exceptions=True))
+    assert reads == [FILENAME]
+    assert results[:3] == expected
+    assert isinstance(results[3], NameError)
+
+    with pytest.raises(NameError):
+        asyncio.run(aio.aextract(FILENAME, 'missing'))
+    assert len(reads) == 2
+
+def test_aparse():
+    match = extract.extract(FILENAME, 'function_with_docstring')
+    with concurrent.futures.ProcessPoolExecutor(1) as pool:
+        service = aio.AsyncExtract(cpu_executor=pool, concurrency=2)
+        parser = asyncio.run(service.parse(match['docstring']))
+    expected = aio._parse(match['docstring'], 'Google', FILENAME)
+    assert parser.data == expected.data
+
+    parser = asyncio.run(aio.aparse(match['docstring']))
+    assert parser.data == expected.data
+
+def test_several_loops():
+    # The default instance must work in every loop, e.g., one per test or
+    # after a service restart, even if the semaphore was saturated.
+    service = aio.configure(concurrency=1)
+    queries = [(FILENAME, 'function_with_docstring'),
+               (FILENAME, 'ExampleOldClass')] * 3
+    try:
+        for _ in range(2):
+            results = asyncio.run(aio.aextract_many(queries))
+            assert [r['label'] for r in results] == [q for _, q in queries]
+    finally:
+        aio.configure()
+    assert aio.default() is not service
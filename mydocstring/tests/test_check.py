@@ -0,0 +1,74 @@
+from .. import check
+
+SOURCE = '''
+def documented(a, b=1, *args, **kwargs):
+    """
+    Summary.
+
+    Args:
+        a: First.
+        b (int): Second.
+        *args: Positional.
+        **kwargs: Keywords.
+    """
+
+def mismatch(a, c):
+    """
+    Args:
+        a: First.
+        b: Second.
+    """
+
+def no_args_section(a):
+    """Summary."""
+
+def undocumented():
+    def nested():
+        pass
+
+def _private():
+    pass
+
+class Public(object):
+    def method(self, x, y):
+        """
+        Args:
+            x: First.
+        """
+
+    def __init__(self):
+        pass
+
+class _Private(object):
+    def method(self):
+        pass
+'''
+
+def test_check_source():
+    problems = check.check_source(SOURCE, 'module.py')
+    found = dict([(p['label'], p['message']) for p in problems])
+    assert found == {
+        'mismatch' : 'undocumented arguments: c; unknown arguments: b',
+        'undocumented' : 'missing docstring',
+        'Public' : 'missing docstring',
+        'Public.method' : 'undocumented arguments: y'}
+    assert problems[0]['filename'] == 'module.py'
+    assert problems[0]['lineno'] == 13
+
+def test_arguments():
+    assert check.arguments('(a, b=(1, 2), *, c: int = 3, **kw)') == [
+        'a', 'b', 'c', 'kw']
+    assert check.arguments('(self, a, /, b)', method=True) == ['a', 'b']
+    assert check.arguments('(a)', method=True) == ['a']
+    assert check.arguments('()') == []
+
+def test_check(tmpdir):
+    tmpdir.join('good.py').write('def f(a):\n    """\n    Args:\n'
+                                 '        a: A.\n    """\n')
+    tmpdir.join('bad.py').write('def g(a):\n    pass\n')
+    tmpdir.join('notes.txt').write('def h(a):\n    pass\n')
+    for jobs in [1, 2]:
+        problems = check.check([str(tmpdir)], jobs=jobs)
+        assert [p['label'] for p in problems] == ['g']
+    assert check.check([str(tmpdir.join('good.py'))]) == []
+    assert check.check([str(tmpdir.join('notes.txt'))]) == []
@@ -0,0 +1,66 @@
+import sys
+import pytest
+from .. import docstring
+
+SOURCE = '''import abc
+
+class Outer(object):
+    """Outer class."""
+
+    class Inner(abc.ABC, object):
+        """Inner class."""
+
+        def method(self):
+            """Inner method."""
+            return 1
+
+def outer():
+    """Outer function."""
+    def inner():
+        """Inner function."""
+        pass
+    return inner
+'''
+
+def run(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, 'argv', ['mydocstring'] + list(args))
+    docstring.main()
+    return capsys.readouterr().out
+
+def test_line(monkeypatch, capsys, tmpdir):
+    filename = str(tmpdir.join('nested.py'))
+    with open(filename, 'w') as fh:
+        fh.write(SOURCE)
+    out = run(monkeypatch, capsys, filename, '--line=11', '-t')
+    assert out.startswith('Outer.Inner.method(self)')
+    assert 'Inner method.' in out
+    out = run(monkeypatch, capsys, filename, '--line=7', '-t')
+    assert 'Inner class.' in out
+    out = run(monkeypatch, capsys, filename, '--line=17', '-t')
+    assert 'Inner function.' in out
+    out = run(monkeypatch, capsys, filename, '--line=18', '-j')
+    assert 'Outer function.' in out
+    # Neither the import nor the module has a docstring.
+    with pytest.raises(NameError):
+        run(monkeypatch, capsys, filename, '--line=1', '-t')
+
+def test_phases_not_nested(monkeypatch, capsys):
+    from .. import profile
+    depth = []
+    enter = profile._Phase.__enter__
+    exit = profile._Phase.__exit__
+
+    def nested_enter(self):
+        assert not depth, 'phase %s started within %s' % (self.name, depth)
+        depth.append(self.name)
+        return enter(self)
+
+    def nested_exit(self, *args):
+        depth.pop()
+        return exit(self, *args)
+
+    monkeypatch.setattr(profile._Phase, '__enter__', nested_enter)
+    monkeypatch.setattr(profile._Phase, '__exit__', nested_exit)
+    for fmt in ['-t', '-j', '-m']:
+        run(monkeypatch, capsys, 'fixtures/example.py',
+            'function_with_docstring', fmt, '--profile', '--xref=fixtures')
@@ -0,0 +1,97 @@
+from .. import diff
+
+OLD = '''
+def same(a):
+    """Same."""
+
+def changed(a, b):
+    """
+    Args:
+        a: First.
+        b: Second.
+    """
+
+def removed():
+    pass
+'''
+
+NEW = '''
+def same(a):
+    """Same."""
+
+def changed(a, c):
+    """
+    Args:
+        a: First.
+        c: Third.
+    """
+
+def added():
+    pass
+'''
+
+def write_trees(tmpdir):
+    old = tmpdir.mkdir('old')
+    new = tmpdir.mkdir('new')
+    old.join('module.py').write(OLD)
+    new.join('module.py').write(NEW)
+    old.join('unchanged.py').write('def f():\n    pass\n')
+    new.join('unchanged.py').write('def f():\n    pass\n')
+    return str(old), str(new)
+
+def test_diff(tmpdir):
+    old, new = write_trees(tmpdir)
+    result = diff.diff(old, new)
+    assert result['added'] == [{'filename' : 'module.py', 'label' : 'added'}]
+    assert result['removed'] == [{'filename' : 'module.py',
+                                  'label' : 'removed'}]
+    assert len(result['changed']) == 1
+    change = result['changed'][0]
+    assert change['label'] == 'changed'
+    assert change['changes'] == ['signature', 'docstring']
+    assert change['args'] == {'added' : ['c'], 'removed' : ['b']}
+    assert change['documented'] == {'added' : ['c'], 'removed' : ['b']}
+    assert diff.format_text(result) == ('+ module.py:added\n'
+                                        '- module.py:removed\n'
+                                        '~ module.py:changed (signature, '
+                                        'docstring, args: +c -b, '
+                                        'documented: +c -b)')
+
+    assert diff.diff(old, old) == {'added' : [], 'removed' : [],
+                                   'changed' : []}
+    # Files are compared to each other, regardless of their names
+    result = diff.diff(old + '/module.py', new + '/unchanged.py')
+    assert [item['label'] for item in result['removed']] == [
+        'same', 'changed', 'removed']
+
+def test_diff_archives(tmpdir):
+    import tarfile
+    import zipfile
+    old, new = write_trees(tmpdir)
+    old_archive = str(tmpdir.join('old.tar.gz'))
+    with tarfile.open(old_archive, 'w:gz') as archive:
+        archive.add(old, 'package-1.0')
+    new_archive = str(tmpdir.join('new.zip'))
+    with zipfile.ZipFile(new_archive, 'w') as archive:
+        archive.writestr('package-1.1/module.py', NEW)
+        archive.writestr('package-1.1/unchanged.py', 'def f():\n    pass\n')
+    assert diff.diff(old_archive, new_archive) == diff.diff(old, new)
+    assert diff.diff(old_archive, new) == diff.diff(old, new)
+
+def test_diff_wheel(tmpdir):
+    # A wheel holds the package itself, and a source distribution wraps it in
+    # `package-1.0/`.
+    import tarfile
+    import zipfile
+    old, _ = write_trees(tmpdir)
+    sdist = str(tmpdir.join('package-1.0.tar.gz'))
+    with tarfile.open(sdist, 'w:gz') as archive:
+        archive.add(old, 'package-1.0/package')
+    wheel = str(tmpdir.join('package-1.0-py3-none-any.whl'))
+    with zipfile.ZipFile(wheel, 'w') as archive:
+        archive.write(old + '/module.py', 'package/module.py')
+        archive.write(old + '/unchanged.py', 'package/unchanged.py')
+    assert sorted(diff.read_tree(wheel)) == ['package/module.py',
+                                             'package/unchanged.py']
+    assert diff.diff(sdist, wheel) == {'added' : [], 'removed' : [],
+                                       'changed' : []}
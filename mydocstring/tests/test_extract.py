@@ -18,6 +18,8 @@ def test_extract():
     
     match = extract.extract(example, 'ExampleOldClass')
     assert match['class'] == 'ExampleOldClass'
+    assert match['function'] == ''
+    assert match['signature'] == ''
     assert match['type'] == 'class'
     
     match = extract.extract(example, 'ExampleNewClass')
@@ -29,3 +31,81 @@ def test_extract():
 
     with pytest.raises(NameError) : extract.extract(example, 'something')
     with pytest.raises(ValueError) : extract.extract(example, 'something.a.a')
+
+def test_extract_spans():
+    example = 'fixtures/example.py'
+    src = open(example, 'rb').read()
+
+    match = extract.extract(example, 'function_with_docstring')
+    assert match['lineno'] == 5
+    assert match['end_lineno'] == 21
+    assert match['docstring_lineno'] == 6
+    assert match['docstring_end_lineno'] == 20
+    definition = src[match['offset']:match['end_offset']]
+    assert definition.startswith(b'def function_with_docstring(')
+    assert definition.endswith(b'    pass')
+    docstring = src[match['docstring_offset']:match['docstring_end_offset']]
+    assert docstring.startswith(b'"""Short description.')
+    assert docstring.endswith(b'"""')
+
+    match = extract.extract(example, 'ExampleOldClass')
+    assert (match['lineno'], match['end_lineno']) == (23, 44)
+
+    match = extract.extract(example, 'ExampleNewClass.__init__')
+    assert (match['lineno'], match['end_lineno']) == (50, 54)
+
+    match = extract.extract(example, '')
+    assert (match['lineno'], match['end_lineno']) == (1, 3)
+
+def test_extract_spans_crlf(tmpdir):
+    # Offsets refer to the bytes of the file, including the `\r` of each line.
+    filename = str(tmpdir.join('crlf.py'))
+    src = ('def f():\r\n    """F \u00e9."""\r\n    a\r\n\r\n'
+           'def g():\r\n    """G."""\r\n    pass\r\n').encode('utf-8')
+    with open(filename, 'wb') as fh:
+        fh.write(src)
+    for name, doc in [('f', 'F \u00e9.'), ('g', 'G.')]:
+        match = extract.extract(filename, name)
+        assert match['docstring'].strip() == doc
+        definition = src[match['offset']:match['end_offset']]
+        assert definition.startswith(('def %s():' % name).encode())
+        docstring = src[match['docstring_offset']:
+                        match['docstring_end_offset']]
+        assert docstring.startswith(b'"""') and docstring.endswith(b'."""')
+
+def test_extract_lazy_source():
+    import pickle
+    import json
+    match = extract.extract('fixtures/example.py', 'ExampleNewClass.__init__')
+    assert 'source' in match
+    assert 'source' in match.keys()
+    assert match._lazy
+    copy = match.copy()
+    assert copy.setdefault('source').startswith('def __init__(self):\n')
+    assert match._lazy
+    assert json.loads(json.dumps(dict(match)))['source'] == copy['source']
+    assert not match._lazy
+
+    match = extract.extract('fixtures/example.py', 'function_with_docstring')
+    copy = pickle.loads(pickle.dumps(match))
+    assert copy['source'] == match['source']
+
+def test_extract_source():
+    src = open('fixtures/example.py').read()
+    match = extract.extract_source(src, 'ExampleNewClass', 'buffer.py')
+    assert match['filename'] == 'buffer.py'
+    expected = extract.extract('fixtures/example.py', 'ExampleNewClass')
+    assert match['docstring'] == expected['docstring']
+    assert match['lineno'] == expected['lineno']
+
+    match = extract.extract_source(src.encode('utf-8'),
+                                   'function_with_docstring')
+    assert match['filename'] == '<string>'
+    assert match['signature'] == '(arg1, arg2=True)'
+
+    extractor = extract.PyExtract.from_source(src)
+    assert extractor.index is extract.PyExtract.from_source(src).index
+    assert 'ExampleOldClass.__init__' in extractor.index.names
+
+    with pytest.raises(NameError) : extract.extract_source(src, 'something')
+    with pytest.raises(NotImplementedError) : extract.extract('example.c', 'f')
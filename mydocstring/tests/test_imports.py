@@ -0,0 +1,73 @@
+import pytest
+from .. import extract
+from .. import imports
+
+INIT = '''
+"""Package docstring."""
+from ._impl import Client, helper as run
+from .sub import *
+from . import util
+'''
+
+IMPL = '''
+class Client(object):
+    """A client."""
+
+    def connect(self):
+        """Connects the client."""
+        pass
+
+def helper():
+    """Helps."""
+    pass
+'''
+
+SUB_INIT = '''
+from .core import (Server,  # the server
+                   Other)
+'''
+
+CORE = '''
+class Server(object):
+    """A server."""
+    pass
+'''
+
+def make_package(tmpdir):
+    pkg = tmpdir.mkdir('pkg')
+    pkg.join('__init__.py').write(INIT)
+    pkg.join('_impl.py').write(IMPL)
+    pkg.join('util.py').write('def tool():\n    """A tool."""\n')
+    sub = pkg.mkdir('sub')
+    sub.join('__init__.py').write(SUB_INIT)
+    sub.join('core.py').write(CORE)
+    return str(tmpdir), str(pkg)
+
+def test_parse_imports():
+    names, stars = imports.parse_imports(SUB_INIT, 'pkg.sub')
+    assert names == {'Server' : ('pkg.sub.core', 'Server'),
+                     'Other' : ('pkg.sub.core', 'Other')}
+    assert stars == []
+    names, stars = imports.parse_imports(INIT, 'pkg')
+    assert names['run'] == ('pkg._impl', 'helper')
+    assert names['util'] == ('pkg', 'util')
+    assert stars == ['pkg.sub']
+    assert imports.absolute('..core', 'pkg.sub') == 'pkg.core'
+    assert imports.absolute('os.path', 'pkg') == 'os.path'
+
+def test_resolve(tmpdir):
+    imports.clear_cache()
+    root, pkg = make_package(tmpdir)
+    filename, label = imports.resolve(root, 'pkg.Client.connect')
+    assert filename.endswith('_impl.py') and label == 'Client.connect'
+    assert imports.resolve(pkg, 'pkg.run')[1] == 'helper'
+    assert imports.resolve(root, 'pkg.util.tool')[1] == 'tool'
+    assert imports.resolve(root, 'pkg.Server')[0].endswith('core.py')
+    assert imports.resolve(root, 'pkg') == (pkg + '/__init__.py', '')
+    assert imports.get(pkg) is imports.get(root)
+    with pytest.raises(NameError): imports.resolve(root, 'pkg.Missing')
+    with pytest.raises(NameError): imports.resolve(root, 'other.Client')
+
+    filename, label = imports.resolve(root, 'pkg.Client.connect')
+    docstring = extract.extract(filename, label)['docstring']
+    assert docstring.strip() == 'Connects the client.'
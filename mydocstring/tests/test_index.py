@@ -0,0 +1,141 @@
+from .. import index
+from ..extract import extract
+
+def test_scan():
+    example = 'fixtures/example.py'
+    fileindex = index.FileIndex.from_file(example)
+    labels = [symbol['label'] for symbol in fileindex.symbols]
+    assert labels == ['', 'function_with_docstring', 'ExampleOldClass',
+                      'ExampleOldClass.__init__',
+                      'ExampleOldClass.class_function_with_docstring',
+                      'ExampleNewClass', 'ExampleNewClass.__init__',
+                      '__init__']
+
+    symbol = fileindex.lookup('function_with_docstring')
+    assert symbol['type'] == 'function'
+    assert symbol['signature'] == '(arg1, arg2=True)'
+    assert symbol['lineno'] == 5
+    assert symbol['end_lineno'] == 21
+    assert symbol['docstring_lineno'] == 6
+
+    symbol = fileindex.lookup('ExampleNewClass')
+    assert symbol['signature'] == '(object)'
+    assert symbol['type'] == 'class'
+
+    symbol = fileindex.lookup('ExampleOldClass.__init__')
+    assert symbol['class'] == 'ExampleOldClass'
+    assert symbol['function'] == '__init__'
+    assert symbol['type'] == 'method'
+
+    for query in ['function_with_docstring', 'ExampleOldClass',
+                  'ExampleOldClass.class_function_with_docstring']:
+        assert (fileindex.lookup(query)['docstring'] ==
+                extract(example, query)['docstring'])
+
+    import pytest
+    with pytest.raises(NameError): fileindex.lookup('something')
+
+def test_scan_nested():
+    src = ('def outer(a,\n'
+           '          b):\n'
+           '    x = """\n'
+           'def fake():\n'
+           '"""\n'
+           '    def inner():\n'
+           "        '''Inner.'''\n"
+           '        pass\n'
+           '\n'
+           'class A(B):\n'
+           '    class C:\n'
+           '        def method(self):\n'
+           '            pass\n'
+           '    # comment\n'
+           'x = 1\n')
+    symbols = index.FileIndex.from_source(src).names
+    assert sorted(symbols) == ['', 'A', 'A.C', 'A.C.method', 'outer',
+                               'outer.inner']
+    assert symbols['outer']['signature'] == '(a,\n          b)'
+    assert symbols['outer']['docstring'] is None
+    assert symbols['outer']['end_lineno'] == 8
+    assert symbols['outer.inner']['docstring'] == '\nInner.'
+    assert symbols['A.C.method']['type'] == 'method'
+    assert symbols['A.C.method']['class'] == 'A.C'
+    assert symbols['A']['end_lineno'] == 13
+
+def test_symbol_table():
+    table = index.SymbolTable.from_package('fixtures')
+    module, symbol = table.lookup('fixtures.example.ExampleOldClass')
+    assert module == 'fixtures.example'
+    assert symbol['label'] == 'ExampleOldClass'
+    assert table.lookup('ExampleOldClass') == (module, symbol)
+    assert table.lookup('example.function_with_docstring')
+    # Defined by several classes
+    assert table.lookup('__init__') is None
+    assert 'ExampleNewClass.__init__' in table
+    assert 'missing' not in table
+
+def test_module_name():
+    assert index.module_name('pkg/sub/mod.py') == 'pkg.sub.mod'
+    assert index.module_name('pkg/sub/__init__.py') == 'pkg.sub'
+    assert index.module_name('root/pkg/mod.py', 'root') == 'pkg.mod'
+
+def test_get(tmpdir):
+    import os
+    index.clear_cache()
+    src = tmpdir.join('module.py')
+    src.write('def f():\n    pass\n')
+    filename = str(src)
+    first = index.get(filename)
+    assert index.get(filename) is first
+    src.write('def g():\n    pass\n')
+    os.utime(filename, (1, 1))
+    assert sorted(index.get(filename).names) == ['', 'g']
+
+    txt = 'class A:\n    pass\n'
+    assert index.get('<buffer>', txt) is index.get('<buffer>', txt[:])
+    assert index.get('<buffer>', txt + '\n') is not index.get('<buffer>', txt)
+
+def test_at():
+    fileindex = index.FileIndex.from_file('fixtures/example.py')
+    labels = dict([(lineno, fileindex.at(lineno)['label'])
+                   for lineno in [1, 5, 21, 22, 27, 28, 34, 40, 56, 100]])
+    assert labels == {1 : '', 5 : 'function_with_docstring',
+                      21 : 'function_with_docstring', 22 : '',
+                      27 : 'ExampleOldClass', 28 : 'ExampleOldClass.__init__',
+                      34 : 'ExampleOldClass',
+                      40 : 'ExampleOldClass.class_function_with_docstring',
+                      56 : '__init__', 100 : ''}
+
+    src = ('class A:\n'
+           '    """A."""\n'
+           '    def f(self):\n'
+           '        def g():\n'
+           '            pass\n'
+           '        return g\n')
+    fileindex = index.FileIndex.from_source(src)
+    assert fileindex.at(5)['label'] == 'A.f.g'
+    assert fileindex.at(5, docstring=True)['label'] == 'A'
+    assert fileindex.at(6)['label'] == 'A.f'
+    assert fileindex.at(10, docstring=True) is None
+
+    import pytest
+    with pytest.raises(ValueError): fileindex.at(0)
+
+def test_get_threads(monkeypatch):
+    # Entries are evicted while other threads look them up.
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    monkeypatch.setattr(index, 'CACHE_SIZE', 2)
+    sources = ['def f%d():\n    """Doc."""\n' % i for i in range(3)]
+    def run(i):
+        for _ in range(200):
+            assert 'f%d' % i in index.get('<string>', sources[i]).names
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(run, [0, 1, 2] * 16))
+    finally:
+        sys.setswitchinterval(interval)
+    assert len(index._CACHE) <= 2
+    index.clear_cache()
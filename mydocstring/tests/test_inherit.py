@@ -0,0 +1,129 @@
+import pytest
+from .. import extract
+from .. import inherit
+
+BASE = '''
+class Base(object):
+    def run(self, x):
+        """
+        Runs the task.
+
+        Args:
+            x: The input.
+        """
+        pass
+
+    def stop(self):
+        """Stops the task."""
+        pass
+'''
+
+IMPL = '''
+from .base import Base
+
+class Middle(Base):
+    def stop(self):
+        """Stops the middle task."""
+        pass
+
+class Impl(Middle, base.Mixin):
+    def run(self, x):
+        return x
+
+    def stop(self):
+        pass
+
+    def other(self):
+        pass
+'''
+
+def make_package(tmpdir):
+    pkg = tmpdir.mkdir('pkg')
+    pkg.join('__init__.py').write('')
+    pkg.join('base.py').write(BASE)
+    pkg.join('impl.py').write(IMPL)
+    return str(pkg.join('impl.py'))
+
+def test_inherit(tmpdir):
+    inherit.clear_cache()
+    filename = make_package(tmpdir)
+    with pytest.raises(NameError): extract.extract(filename, 'Impl.run')
+
+    match = extract.extract(filename, 'Impl.run', inherit=True)
+    assert match['docstring'].strip().startswith('Runs the task.')
+    assert match['class'] == 'Impl'
+    assert match['label'] == 'Impl.run'
+    assert match['inherited'] == 'Base.run'
+    assert match['filename'].endswith('base.py')
+
+    match = extract.extract(filename, 'Impl.stop', inherit=True)
+    assert match['docstring'] == '\nStops the middle task.'
+    assert match['inherited'] == 'Middle.stop'
+    assert match['filename'] == filename
+
+    with pytest.raises(NameError):
+        extract.extract(filename, 'Impl.other', inherit=True)
+
+def test_mro_memoized(tmpdir):
+    inherit.clear_cache()
+    filename = make_package(tmpdir)
+    resolver = inherit.resolver(filename)
+    assert inherit.resolver(filename) is resolver
+    fileindex = extract.PyExtract(filename).index
+    mro = resolver.mro(fileindex, 'Impl')
+    assert [cls['label'] for index, cls in mro] == ['Impl', 'Middle', 'Base']
+    assert resolver.mro(fileindex, 'Impl') is mro
+
+def test_inherit_file_changed(tmpdir):
+    # The symbol table is built again when a file of the package changes.
+    inherit.clear_cache()
+    filename = make_package(tmpdir)
+    match = extract.extract(filename, 'Impl.run', inherit=True)
+    assert match['lineno'] == 3
+    tmpdir.join('pkg', 'base.py').write('import os\n\n' + BASE)
+    match = extract.extract(filename, 'Impl.run', inherit=True)
+    assert match['lineno'] == 5
+    assert match['docstring'].strip().startswith('Runs the task.')
+
+def test_extract_symbol_stale():
+    symbol = extract.PyExtract('<string>', 'def f():\n    """Doc."""\n'
+                               ).index.names['f']
+    with pytest.raises(NameError):
+        extract.PyExtract('<string>', '\n\ndef f():\n    """Doc."""\n'
+                          ).extract_symbol(symbol)
+
+def test_inherit_source():
+    src = ('class A:\n    def f(self):\n        """Doc."""\n\n'
+           'class B(A):\n    def f(self):\n        pass\n')
+    match = extract.extract_source(src, 'B.f', inherit=True)
+    assert match['inherited'] == 'A.f'
+    assert match['docstring'] == '\nDoc.'
+
+def test_inherit_before_later_class():
+    # The docstring of `C.f` must not be mistaken for the one of `B.f`.
+    src = ('class A(object):\n    def f(self):\n        """A doc."""\n\n'
+           'class B(A):\n    def f(self):\n        pass\n\n'
+           'class C(object):\n    def f(self):\n        """C doc."""\n')
+    match = extract.extract_source(src, 'B.f', inherit=True)
+    assert match['docstring'] == '\nA doc.'
+    assert match['inherited'] == 'A.f'
+    assert match['label'] == 'B.f'
+    assert match['lineno'] == 2
+
+def test_inherit_diamond():
+    # Python's method resolution order for `D` is D, B, C, A.
+    src = ('class A(object):\n    def f(self):\n        """A doc."""\n\n'
+           'class B(A):\n    pass\n\n'
+           'class C(A):\n    def f(self):\n        """C doc."""\n\n'
+           'class D(B, C):\n    def f(self):\n        pass\n')
+    match = extract.extract_source(src, 'D.f', inherit=True)
+    assert match['inherited'] == 'C.f'
+    fileindex = extract.PyExtract('<string>', src).index
+    mro = inherit.Resolver().mro(fileindex, 'D')
+    assert [cls['label'] for index, cls in mro] == ['D', 'B', 'C', 'A']
+
+def test_bases():
+    assert inherit.bases('(Base, mixins.Mixin, metaclass=Meta)') == [
+        'Base', 'mixins.Mixin']
+    assert inherit.bases('(Generic[T], object)') == ['Generic']
+    assert inherit.bases('') == []
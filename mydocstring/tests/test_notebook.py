@@ -0,0 +1,45 @@
+import io
+import json
+from .. import extract
+from .. import notebook
+
+CELLS = [{'cell_type' : 'markdown', 'metadata' : {},
+          'source' : ['# Helpers\n', 'def not_code(): pass']},
+         {'cell_type' : 'code', 'execution_count' : 1, 'metadata' : {},
+          'outputs' : [{'output_type' : 'display_data',
+                        'data' : {'image/png' : 'iVBOR\\"{[' * 1000}}],
+          'source' : ['import os']},
+         {'cell_type' : 'code', 'execution_count' : None, 'metadata' : {},
+          'outputs' : [],
+          'source' : ['x = 1\n', '\n', 'def helper(a):\n',
+                      '    """\n', '    Helps.\n', '\n', '    Args:\n',
+                      '        a: The input.\n', '    """\n',
+                      '    return a\n']},
+         {'cell_type' : 'code', 'metadata' : {}, 'outputs' : [],
+          'source' : 'class Tool(object):\n    """A tool."""\n    pass'}]
+
+NOTEBOOK = json.dumps({'cells' : CELLS, 'metadata' : {'kernelspec' : {}},
+                       'nbformat' : 4, 'nbformat_minor' : 5}, indent=1)
+
+def test_code_cells():
+    for chunk_size in [1, 7, 4096]:
+        cells = list(notebook.code_cells(io.StringIO(NOTEBOOK), chunk_size))
+        assert [cell for cell, _ in cells] == [1, 2, 3]
+        assert cells[0][1] == 'import os'
+        assert cells[2][1].startswith('class Tool')
+
+def test_extract_notebook(tmpdir):
+    filename = str(tmpdir.join('helpers.ipynb'))
+    with open(filename, 'w') as fh:
+        fh.write(NOTEBOOK)
+    out = extract.extract(filename, 'helper')
+    assert 'Helps.' in out['docstring']
+    assert out['cell'] == 2
+    assert out['cell_lineno'] == 3
+    assert out['cell_end_lineno'] == 10
+    assert out['source'].startswith('def helper(a):')
+
+    out = extract.extract_source(NOTEBOOK.encode('utf-8'), 'Tool',
+                                 'helpers.ipynb')
+    assert out['docstring'].strip() == 'A tool.'
+    assert out['cell'] == 3 and out['cell_lineno'] == 1
@@ -0,0 +1,117 @@
+import json
+import pytest
+from .. import command
+from .. import extract
+from .. import pipeline
+
+SOURCE = '''"""Module."""
+import abc
+
+class Base(abc.ABC):
+    """Base class."""
+
+    def method(self):
+        """Base method."""
+
+class Mixed(Base, object):
+    """Mixed class."""
+
+    def method(self):
+        """Mixed method."""
+        return 1
+
+def outer():
+    """Outer function."""
+    def inner():
+        """Inner function."""
+        pass
+    return inner
+
+def broken():
+    """
+    Broken.
+
+    Args:
+    """
+'''
+
+def test_process_file():
+    with open('fixtures/example.py', 'rb') as fh:
+        items, skipped, elapsed = pipeline.process_file('fixtures/example.py',
+                                                        fh.read())
+    labels = [item['docstring']['label'] for item in items]
+    assert 'function_with_docstring' in labels
+    assert 'ExampleOldClass.class_function_with_docstring' in labels
+    # The source code of functions is only needed for Markdown output.
+    function = items[labels.index('function_with_docstring')]['docstring']
+    assert 'source' not in function
+    assert skipped == []
+    assert elapsed >= 0
+
+def test_process_file_bases():
+    items, skipped, _ = pipeline.process_file('pp.py', SOURCE.encode(), True)
+    labels = [item['docstring']['label'] for item in items]
+    assert labels == ['', 'Base', 'Base.method', 'Mixed', 'Mixed.method',
+                      'outer', 'outer.inner']
+    method = items[labels.index('Mixed.method')]['docstring']
+    assert method['class'] == 'Mixed'
+    assert method['docstring'].strip() == 'Mixed method.'
+    assert 'return 1' in method['source']
+    assert [(item['label'], item['lineno']) for item in skipped] == \
+           [('broken', 24)]
+
+def test_pipeline(tmpdir):
+    out = str(tmpdir.join('text'))
+    stats = pipeline.run(['fixtures'], output=out, jobs=1, queue_size=1)
+    assert stats['files'] == 1
+    assert stats['stages']['write']['items'] == 1
+    assert stats['queues']['read']['max_depth'] <= 1
+    txt = tmpdir.join('text', 'example.txt').read()
+    expected = command.format_text(extract.extract('fixtures/example.py',
+                                                   'function_with_docstring'))
+    assert expected in txt
+
+    out = str(tmpdir.join('json'))
+    stats = pipeline.run(['fixtures/example.py'], output=out, fmt='json',
+                         readers=2, jobs=2)
+    data = json.loads(tmpdir.join('json', 'example.json').read())
+    assert len(data) == stats['symbols']
+    assert data[0]['sections']
+
+    out = str(tmpdir.join('markdown'))
+    pipeline.run(['fixtures'], output=out, fmt='markdown', jobs=1)
+    assert '# function_with_docstring' in \
+           tmpdir.join('markdown', 'example.md').read()
+
+    with pytest.raises(ValueError): pipeline.Pipeline(['fixtures'], fmt='rst')
+
+def test_pipeline_bases(tmpdir):
+    tmpdir.join('pp.py').write(SOURCE)
+    out = str(tmpdir.join('out'))
+    stats = pipeline.run([str(tmpdir.join('pp.py'))], output=out, jobs=1)
+    assert stats['symbols'] == 7
+    assert [item['label'] for item in stats['skipped']] == ['broken']
+    txt = tmpdir.join('out', 'pp.txt').read()
+    assert 'Mixed.method(self)' in txt
+    assert 'Inner function.' in txt
+
+def test_pipeline_names(tmpdir):
+    # The output of each directory is written to a directory of its own.
+    for name in ['a', 'b']:
+        tmpdir.mkdir(name).join('__init__.py').write('"""%s."""\n' % name)
+    out = str(tmpdir.join('out'))
+    pipeline.run([str(tmpdir.join('a')), str(tmpdir.join('b'))], output=out,
+                 jobs=1)
+    assert 'a.' in tmpdir.join('out', 'a', '__init__.txt').read()
+    assert 'b.' in tmpdir.join('out', 'b', '__init__.txt').read()
+
+    with pytest.raises(ValueError):
+        pipeline.run([str(tmpdir.join('a', '__init__.py')),
+                      str(tmpdir.join('b', '__init__.py'))], output=out)
+    assert not tmpdir.join('out', '__init__.txt').check()
+
+def test_process_file_uncached():
+    from .. import index
+    index.clear_cache()
+    pipeline.process_file('pp.py', SOURCE.encode())
+    assert not index._CACHE
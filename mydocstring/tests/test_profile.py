@@ -0,0 +1,48 @@
+from .. import profile
+from .. import parse
+from ..extract import extract
+
+def test_profile():
+    profiler = profile.enable()
+    match = extract('fixtures/example.py', 'function_with_docstring')
+    parse.parser(match['docstring'], filename='fixtures/example.py').parse()
+    assert profile.disable() is profiler
+    assert profile.active() is None
+
+    report = profiler.report()
+    for phase in ['read', 'extract', 'parse']:
+        assert report['phases'][phase]['calls'] == 1
+        assert report['phases'][phase]['time'] >= 0
+        assert 'peak_memory' not in report['phases'][phase]
+    assert report['files']['fixtures/example.py']['parse']['calls'] == 1
+
+def test_profile_memory():
+    profiler = profile.enable(memory=True)
+    extract('fixtures/example.py', 'ExampleOldClass')
+    profile.disable()
+    assert profiler.report()['phases']['read']['peak_memory'] > 0
+
+def test_profile_memory_phase():
+    # Memory allocated before a phase does not count towards its peak.
+    profiler = profile.enable(memory=True)
+    data = bytearray(10 ** 7)
+    with profile.phase('small', 'x'):
+        small = bytearray(10 ** 5)
+    profile.disable()
+    assert 10 ** 5 <= profiler.report()['phases']['small']['peak_memory'] < \
+           10 ** 6
+    del data, small
+
+def test_profile_callback():
+    from json import loads
+    reports = []
+    profiler = profile.enable(callback=reports.append)
+    extract('fixtures/example.py', 'ExampleOldClass')
+    profile.disable()
+    profiler.emit()
+    assert reports[0]['phases']['extract']['calls'] == 1
+    assert loads(profiler.__json__())['phases'] == reports[0]['phases']
+
+def test_profile_disabled():
+    extract('fixtures/example.py', 'ExampleOldClass')
+    assert profile.active() is None
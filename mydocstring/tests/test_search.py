@@ -0,0 +1,74 @@
+from .. import search
+
+def test_search():
+    index = search.SearchIndex()
+    index.add('fixtures/example.py', open('fixtures/example.py').read())
+
+    hits = index.search('short description')
+    assert [hit['label'] for hit in hits] == ['function_with_docstring']
+    assert hits[0]['section'] == 'Summary'
+    assert hits[0]['filename'] == 'fixtures/example.py'
+    assert hits[0]['lineno'] == 5
+
+    hits = index.search('ARG1 description')
+    assert [hit['label'] for hit in hits] == [
+        'function_with_docstring',
+        'ExampleOldClass.class_function_with_docstring']
+    assert set([hit['section'] for hit in hits]) == set(['Args'])
+    assert index.search('missing') == []
+    assert index.search('') == []
+
+def test_update(tmpdir):
+    import os
+    src = tmpdir.join('module.py')
+    src.write('def f():\n    """\n    Raises:\n        KeyError: Oops.\n    """\n')
+    path = str(tmpdir)
+    filename = str(src)
+    index = search.SearchIndex()
+    assert index.update([path]) == [filename]
+    assert index.search('keyerror')[0]['section'] == 'Raises'
+    # Unchanged files are skipped
+    assert index.update([path]) == []
+
+    src.write('def f():\n    """\n    Raises:\n        IndexError: Oops.\n'
+              '    """\n')
+    os.utime(filename, (1, 1))
+    assert index.update([path]) == [filename]
+    assert index.search('keyerror') == []
+    assert index.search('indexerror')
+    assert 'keyerror' not in index.postings
+
+    store = str(tmpdir.join('docs.idx'))
+    index.save(store)
+    loaded = search.SearchIndex.load(store)
+    assert loaded.search('indexerror') == index.search('indexerror')
+
+    src.remove()
+    index.update([path])
+    assert index.files == {}
+    assert index.postings == {}
+
+def test_shards(tmpdir):
+    import pytest
+    path = str(tmpdir)
+    for i in range(10):
+        tmpdir.join('module%d.py' % i).write(
+            'def f%d():\n    """Function number %d."""\n' % (i, i))
+    full = search.SearchIndex()
+    full.update([path])
+
+    merged = search.SearchIndex()
+    files = set()
+    for i in range(1, 4):
+        partial = search.SearchIndex()
+        partial.update([path], (i, 3))
+        assert not files & set(partial.files)
+        files.update(partial.files)
+        merged.merge(partial)
+    assert merged.files == full.files
+    assert merged.postings == full.postings
+    assert len(merged.search('function number')) == 10
+
+    assert search.parse_shard('2/4') == (2, 4)
+    with pytest.raises(ValueError): search.parse_shard('0/4')
+    with pytest.raises(ValueError): search.parse_shard('a/b')
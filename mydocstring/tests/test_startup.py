@@ -0,0 +1,33 @@
+from .. import startup
+
+# Import time (seconds) that the command line interface may spend before it
+# starts working. The budget is generous so that the test is not flaky on
+# slow machines, but it fails if an expensive dependency is imported eagerly.
+BUDGET = 0.25
+
+OUTPUT = '''import time: self [us] | cumulative | imported package
+import time:       246 |        246 |   _io
+import time:       554 |       7860 | docopt
+'''
+
+def test_parse():
+    imports = startup.parse(OUTPUT)
+    assert [item['module'] for item in imports] == ['_io', 'docopt']
+    assert imports[0]['depth'] == 1 and imports[1]['depth'] == 0
+    assert abs(imports[1]['cumulative'] - 7.86e-3) < 1e-9
+    assert 'docopt' in startup.format_text({'total' : 0.01,
+                                            'imports' : imports})
+
+def test_startup_budget():
+    result = startup.measure(['fixtures/example.py',
+                              'function_with_docstring', '-t'])
+    assert result['returncode'] == 0
+    assert result['stdout'].startswith('function_with_docstring')
+    modules = [item['module'] for item in result['imports']]
+    assert 'mydocstring.extract' in modules
+    # Plain-text output neither parses the docstring nor renders a template.
+    assert 'mydocstring.parse' not in modules
+    assert 'mako' not in modules
+    top = sum([item['cumulative'] for item in result['imports']
+               if item['depth'] == 0])
+    assert top < BUDGET
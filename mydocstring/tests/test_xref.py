@@ -0,0 +1,35 @@
+from .. import index
+from .. import xref
+
+def get_table():
+    src = ('class Foo(object):\n'
+           '    def bar(self):\n'
+           '        pass\n'
+           'def baz():\n'
+           '    pass\n')
+    table = index.SymbolTable()
+    table.add('pkg/mod.py', 'pkg.mod', index.FileIndex.from_source(src, 'pkg/mod.py'))
+    return table
+
+def test_link():
+    data = [{'header' : '', 'args' : [],
+             'text' : 'See `Foo.bar` and `baz()`, but not `missing`.'},
+            {'header' : 'Args', 'text' : '',
+             'args' : [{'field' : 'x', 'signature' : '',
+                        'description' : 'A `Foo`.'}]}]
+    out = xref.link(data, get_table())
+    assert out[0]['text'] == ('See [`Foo.bar`](pkg.mod.md#foobar) and '
+                              '[`baz()`](pkg.mod.md#baz), but not `missing`.')
+    assert out[1]['args'][0]['description'] == 'A [`Foo`](pkg.mod.md#foo).'
+    # The input is not modified
+    assert data[1]['args'][0]['description'] == 'A `Foo`.'
+
+def test_link_format():
+    resolver = xref.Resolver(get_table(), '%(filename)s#L%(label)s')
+    assert resolver.text('`pkg.mod.baz`') == '[`pkg.mod.baz`](pkg/mod.py#Lbaz)'
+
+def test_code_blocks():
+    resolver = xref.Resolver(get_table())
+    txt = '```\n`Foo`\n```\n`Foo`'
+    assert resolver.text(txt) == '```\n`Foo`\n```\n[`Foo`](pkg.mod.md#foo)'
+    assert resolver.text('[`Foo`](x)') == '[`Foo`](x)'
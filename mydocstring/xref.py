@@ -0,0 +1,112 @@
+"""
+This module resolves cross-references in parsed docstrings. Names written in
+backticks, such as `Class.method`, are looked up in a `SymbolTable` and
+replaced by Markdown links. Names that cannot be resolved (or that are
+ambiguous) are left untouched.
+"""
+import re
+
+_NAME = re.compile(r'(?<![\[`])`([A-Za-z_][\w.]*)(\(\))?`(?![\]`])')
+
+LINK_FORMAT = '%(module)s.md#%(anchor)s'
+
+class Resolver(object):
+    """
+    Replaces backticked names by links.
+
+    Attributes:
+        table : The `SymbolTable` that names are resolved against.
+        link_format : A format string for the link target. The format string
+            can use the keys `module`, `label`, `anchor`, and `filename`.
+            Defaults to `'%(module)s.md#%(anchor)s'`.
+
+    """
+
+    def __init__(self, table, link_format=LINK_FORMAT):
+        self.table = table
+        self.link_format = link_format
+        self._links = {}
+
+    def link(self, data):
+        """
+        Resolves cross-references in parsed docstring data. The fields `text`
+        and argument `description` of each section are processed.
+
+        Args:
+            data : A list of sections as produced by `DocString.parse`.
+
+        Returns:
+            list: A copy of `data` with the names replaced by links.
+
+        """
+        out = []
+        for section in data:
+            section = dict(section)
+            if section.get('text'):
+                section['text'] = self.text(section['text'])
+            if section.get('args'):
+                args = []
+                for arg in section['args']:
+                    arg = dict(arg)
+                    arg['description'] = self.text(arg['description'])
+                    args.append(arg)
+                section['args'] = args
+            out.append(section)
+        return out
+
+    def text(self, txt):
+        """
+        Resolves cross-references in a string. Fenced code blocks are skipped.
+        """
+        if '`' not in txt:
+            return txt
+        blocks = txt.split('```')
+        for i in range(0, len(blocks), 2):
+            blocks[i] = _NAME.sub(self._replace, blocks[i])
+        return '```'.join(blocks)
+
+    def url(self, name):
+        """
+        Returns the link target for a name, or `None` if the name cannot be
+        resolved. Results are cached.
+        """
+        if name in self._links:
+            return self._links[name]
+        entry = self.table.lookup(name)
+        url = None
+        if entry:
+            module, symbol = entry
+            url = self.link_format % {'module' : module,
+                                      'label' : symbol['label'],
+                                      'anchor' : anchor(symbol['label']),
+                                      'filename' : symbol['filename']}
+        self._links[name] = url
+        return url
+
+    def _replace(self, match):
+        url = self.url(match.group(1))
+        if not url:
+            return match.group(0)
+        return '[%s](%s)' % (match.group(0), url)
+
+def anchor(label):
+    """
+    Returns the Markdown anchor of the header that is produced for a label by
+    the default template (e.g., `Class.method` becomes `classmethod`).
+    """
+    return re.sub(r'[^\w\- ]', '', label.lower()).replace(' ', '-')
+
+def link(data, table, link_format=LINK_FORMAT):
+    """
+    Resolves cross-references in parsed docstring data.
+
+    Args:
+        data : A list of sections as produced by `DocString.parse`.
+        table : The `SymbolTable` to resolve names against.
+        link_format : A format string for the link target (see `Resolver`).
+
+    Returns:
+        list: A copy of `data` with the names replaced by links.
+
+    """
+    return Resolver(table, link_format).link(data)